@@ -1,28 +1,56 @@
+import os
 import pygame
-import sys
 import random
+import sys
+import time
+from typing import Optional
 
-from src.presentation.game_view import GameView, Color
+from src.presentation.game_view import GameView
+from src.presentation.render_scale import RenderScaler
 from src.presentation.input_controller import InputController, GameAction
 from src.infrastructure import PygameAudioAdapter, SystemClockAdapter, LeaderboardAdapter
-from src.application import StartGameUseCase, UpdateGameUseCase, SubmitScoreUseCase
+from src.application import StartGameUseCase, UpdateGameUseCase, SubmitScoreUseCase, FixedTimestep
+from src.application import FrameProfiler, NullFrameProfiler, SimulationThread, LatencyTracker
+from src.domain.simulation import GameSimulation, SimulationConfig, TapResult
+from src.domain.replay import ReplayRecorder
+from src.domain.chart import Chart
 
-from audio_config import get_active_notes, get_active_song_info
+from audio_config import ACTIVE_SONG, get_active_notes, get_active_song_info
 
 class PianoTilesApp:
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None, replay_path: Optional[str] = "last_game.replay",
+                 dirty_rects: bool = False, profile_path: Optional[str] = None,
+                 threaded: bool = False, render_scale: float = 1.0, auto_render_scale: bool = False,
+                 scaled_window: bool = False, background_audio: bool = True):
+        self._init_start = time.perf_counter()
         self.WIDTH = 400
         self.HEIGHT = 600
 
+        # Every session is seeded from this single generator, and the last
+        # session is saved as a replay so it can be reproduced headlessly.
+        self.rng = random.Random(seed)
+        self.replay_path = replay_path
+
         # Initialize infrastructure adapters
         self.clock_adapter = SystemClockAdapter()
         self.leaderboard_adapter = LeaderboardAdapter()
         
-        # Initialize audio adapter
+        # Large kiosk displays: SDL scales the window (scaled_window), and the
+        # frame may be drawn below window resolution, tuned from frame times.
+        self.view = GameView(self.WIDTH, self.HEIGHT, dirty_rects=dirty_rects,
+                             render_scale=render_scale, scaled_window=scaled_window,
+                             scaler=RenderScaler() if auto_render_scale else None)
+        self.input_controller = InputController()
+        self.clock = self.view.get_clock()
+
+        # Initialize audio adapter. Opening the mixer and synthesizing the
+        # notes run on a worker (background_audio) once the window is open,
+        # so the menu is drawn right away; taps before the sounds are
+        # swapped in are silent.
         try:
             notes = get_active_notes()
             song_info = get_active_song_info()
-            self.audio_adapter = PygameAudioAdapter(note_sequence=notes)
+            self.audio_adapter = PygameAudioAdapter(note_sequence=notes, background=background_audio)
             self.audio_enabled = True
         except Exception as e:
             self.audio_adapter = None
@@ -32,7 +60,8 @@ class PianoTilesApp:
         self.start_game_use_case = StartGameUseCase(
             audio_port=self.audio_adapter,
             clock_port=self.clock_adapter,
-            leaderboard_port=self.leaderboard_adapter
+            leaderboard_port=self.leaderboard_adapter,
+            rng=self.rng
         )
         self.update_game_use_case = UpdateGameUseCase(
             audio_port=self.audio_adapter,
@@ -41,41 +70,117 @@ class PianoTilesApp:
         self.submit_score_use_case = SubmitScoreUseCase(
             leaderboard_port=self.leaderboard_adapter
         )
-        
-        self.view = GameView(self.WIDTH, self.HEIGHT)
-        self.input_controller = InputController()
-        self.clock = self.view.get_clock()
 
         self.game_state = "MENU"
         self.running = True
 
-        self.tiles = []
-        self.score = 0
         self.high_score = 0
-        self.speed = 4.0
         self.tile_height = 150
         self.tile_width = self.WIDTH // 4
-        self.last_spawn_time = 0
-        self.base_spawn_interval = 800
-        self.base_speed = self.speed
+
+        # Precompiled chart for the active song (see compile_charts.py);
+        # without one, columns are random.
+        chart_path = os.path.join("charts", f"{ACTIVE_SONG}.chart")
+        self.chart = Chart.load(chart_path) if os.path.exists(chart_path) else None
+
+        self.simulation = GameSimulation(SimulationConfig(
+            board_width=self.WIDTH,
+            board_height=self.HEIGHT,
+            tile_height=self.tile_height,
+            base_speed=4.0,
+            base_spawn_interval=800,
+            speed_increment=0.1
+        ), rng=self.rng, chart=self.chart)
+        # Tiles move in fixed 60 Hz steps; a slow frame runs extra steps
+        # (up to 5) instead of slowing the game down.
+        self.timestep = FixedTimestep(self.simulation.config.frame_ms, max_steps=5)
+
+        # Threaded mode: the simulation steps on its own thread and the loop
+        # below only renders its published snapshots, so a slow frame no
+        # longer delays tile movement or tap handling.
+        self.sim_thread = SimulationThread(self.simulation, max_steps=5) if threaded else None
+        self._session = 0
+        # Session whose replay the simulation thread has yet to publish.
+        self._replay_session: Optional[int] = None
+
+        # Per-phase frame timings, dumped to profile_path on exit; F3 shows
+        # them on screen (and starts profiling if it was off).
+        self.profile_path = profile_path
+        self.profiler = FrameProfiler() if profile_path else NullFrameProfiler()
+        self.show_profiler = False
+        self._profiler_lines = []
+
+        # Tap latency: input event -> hit test -> note dispatch.
+        self.latency = LatencyTracker()
+        # Time to first frame, measured from the start of __init__.
+        self.first_frame_time: Optional[float] = None
 
     def run(self):
+        if self.sim_thread:
+            self.sim_thread.start()
+        self.input_controller.set_state(self.game_state)
+
         while self.running:
+            profiler = self.profiler
+            profiler.begin_frame()
+            elapsed_ms = self.clock_adapter.get_delta_time() * 1000
             actions = self.input_controller.process_events()
             self._handle_actions(actions)
+            # Filter for the state the next events belong to: events of a
+            # type blocked after START or resume would be thrown away.
+            self.input_controller.set_state(self.game_state)
+            profiler.mark('events')
 
             if self.game_state == "PLAYING":
-                self._update_game()
+                self._update_game(elapsed_ms)
+            elif self._replay_session is not None:
+                self._save_published_replay()
+            profiler.mark('update')
+            render_start = time.perf_counter()
             self._render()
+            profiler.mark('render')
+            self.view.update_display()
+            profiler.mark('flip')
+            if self.first_frame_time is None:
+                self.first_frame_time = time.perf_counter()
+            self.view.record_frame_time((time.perf_counter() - render_start) * 1000)
             self.clock.tick(60)
+            profiler.mark('sleep')
+            profiler.end_frame()
+
+        if self.sim_thread:
+            self.sim_thread.stop()
+            if self._replay_session is not None:
+                self._save_published_replay()
+
+        if self.profile_path:
+            self.profiler.dump(self.profile_path, input_latency=self.latency.to_dict(),
+                               input_events=self.input_controller.total_counts,
+                               startup=self._startup_times())
 
         pygame.time.wait(100)
 
+        # pygame.quit() must not run while the audio worker is still loading.
+        if self.audio_adapter:
+            self.audio_adapter.wait_ready(timeout=5.0)
+
         self.view.quit()
         sys.exit()
 
+    def _startup_times(self) -> dict:
+        """
+        Time to first frame and to audio ready, in ms from the start of __init__.
+        """
+        def since_init(t):
+            return None if t is None else round((t - self._init_start) * 1000, 3)
+        return {
+            'first_frame_ms': since_init(self.first_frame_time),
+            'audio_ready_ms': since_init(self.audio_adapter.ready_time if self.audio_adapter else None),
+        }
+
     def _handle_actions(self, actions):
-        for action, data in actions:
+        for entry in actions:
+            action, data = entry
             if action == GameAction.QUIT:
                 self.running = False
 
@@ -92,119 +197,161 @@ class PianoTilesApp:
                     self.game_state = "PAUSED"
                 elif self.game_state == "PAUSED":
                     self.game_state = "PLAYING"
+                if self.sim_thread:
+                    self.sim_thread.set_paused(self.game_state == "PAUSED")
 
             elif action == GameAction.CLICK:
                 if self.game_state == "PLAYING":
-                    self._handle_click(data)
+                    self._handle_click(data, entry.timestamp)
+
+            elif action == GameAction.TOGGLE_PROFILER:
+                self.show_profiler = not self.show_profiler
+                if isinstance(self.profiler, NullFrameProfiler):
+                    self.profiler = FrameProfiler()
 
     def _start_game(self):
         self.game_state = "PLAYING"
-        self.tiles.clear()
-        self.score = 0
-        self.speed = 4.0
-        self.last_spawn_time = pygame.time.get_ticks()
-        self._spawn_row()
-
-    def _update_game(self):
-        current_time = pygame.time.get_ticks()
-
-        spawn_interval = int(self.base_spawn_interval * (self.base_speed / max(self.speed, 0.0001)))
-        if current_time - self.last_spawn_time > spawn_interval:
-            self._spawn_row()
-            self.last_spawn_time = current_time
-            self.speed += 0.1
-
-        for tile in self.tiles:
-            tile['rect'].y += self.speed
-
-        for tile in self.tiles:
-            if (tile['rect'].bottom >= self.HEIGHT and
-                tile['color'] == Color.BLACK and
-                not tile['clicked']):
+        if self.sim_thread:
+            self._session = self.sim_thread.start_session(start_time=pygame.time.get_ticks())
+            return
+        self.simulation.reset(start_time=pygame.time.get_ticks())
+        ReplayRecorder.attach(self.simulation)
+        self.simulation.spawn_row()
+        self.timestep.reset()
+
+    def _update_game(self, elapsed_ms: float):
+        if self.sim_thread:
+            self._collect_simulation_results()
+            return
+
+        for _ in range(self.timestep.advance(elapsed_ms)):
+            if self.simulation.step():
                 self._game_over()
                 return
 
-        self.tiles = [t for t in self.tiles if t['rect'].top < self.HEIGHT]
-
-    def _handle_click(self, position):
-        clicked_tile = self.input_controller.check_tile_click(position, self.tiles)
-
-        if clicked_tile:
-            column = self.input_controller.get_clicked_tile_column(position, self.tile_width)
-
-            if clicked_tile['color'] == Color.BLACK:
-                clicked_tile['clicked'] = True
-                clicked_tile['color'] = Color.GRAY
-                self.score += 1
-
-                if self.audio_enabled and self.audio_adapter:
-                    self.audio_adapter.play_note_for_column(column)
-            else:
-                if self.audio_enabled and self.audio_adapter:
-                    self.audio_adapter.play_error_sound()
-                self._game_over()
-
-    def _spawn_row(self):
-        black_index = random.randint(0, 3)
-
-        for i in range(4):
-            color = Color.BLACK if i == black_index else Color.WHITE
-            rect = pygame.Rect(
-                i * self.tile_width,
-                -self.tile_height,
-                self.tile_width,
-                self.tile_height
-            )
-            self.tiles.append({
-                'rect': rect,
-                'color': color,
-                'clicked': False
-            })
-
-    def _game_over(self):
+    def _collect_simulation_results(self):
+        results = self.sim_thread.results
+        while not results.empty() and self.game_state == "PLAYING":
+            self._handle_tap_result(*results.get())
+
+        snapshot = self.sim_thread.latest
+        if (self.game_state == "PLAYING" and snapshot.session == self._session
+                and snapshot.game_over):
+            self._game_over()
+
+    def _handle_click(self, position, timestamp: float):
+        if self.sim_thread:
+            self.sim_thread.tap(*position, timestamp=timestamp)
+            return
+        result, column = self.simulation.tap(*position)
+        self._handle_tap_result(result, column, timestamp, time.perf_counter(),
+                                self.simulation.score.value)
+
+    def _handle_tap_result(self, result: TapResult, column: int,
+                           event_time: float, hit_test_time: float, score: int):
+        if result == TapResult.HIT:
+            if self.audio_enabled and self.audio_adapter:
+                self.audio_adapter.play_note_for_column(column)
+                # Taps before the sounds are loaded dispatch nothing.
+                if self.audio_adapter.is_ready:
+                    self.latency.record(event_time, hit_test_time, time.perf_counter())
+
+        elif result == TapResult.WRONG:
+            if self.audio_enabled and self.audio_adapter:
+                self.audio_adapter.play_error_sound()
+            # In threaded mode the snapshot may not include the taps handled
+            # with this one yet, so the score comes with the result.
+            self._game_over(score)
+
+    def _game_over(self, score: Optional[int] = None):
         self.game_state = "GAME_OVER"
 
         if self.audio_enabled and self.audio_adapter:
             self.audio_adapter.play_game_over_sound()
 
-        if self.score > self.high_score:
-            self.high_score = self.score
+        if self.replay_path:
+            if self.sim_thread:
+                # The recorder belongs to the simulation thread, which
+                # publishes the replay bytes with its game-over snapshot.
+                self._replay_session = self._session
+                self._save_published_replay()
+            elif self.simulation.recorder:
+                self.simulation.recorder.save(self.replay_path)
+
+        if score is None:
+            score = self.sim_thread.latest.score if self.sim_thread else self.simulation.score.value
+        if score > self.high_score:
+            self.high_score = score
         
         # Save score to leaderboard (only if score > 0)
-        if self.score > 0:
+        if score > 0:
             player_name = "Player"  # You can modify this to get player name from input
-            self.submit_score_use_case.execute(player_name, self.score)
+            self.submit_score_use_case.execute(player_name, score)
+
+    def _save_published_replay(self):
+        snapshot = self.sim_thread.latest
+        if snapshot.session == self._replay_session and snapshot.replay is not None:
+            with open(self.replay_path, 'wb') as f:
+                f.write(snapshot.replay)
+            self._replay_session = None
+        elif snapshot.session > self._replay_session:
+            # A new game started before the old one was published.
+            self._replay_session = None
+
+    def _frame(self):
+        """
+        Return (tiles, score, speed, alpha) to render this frame.
+        """
+        if self.sim_thread:
+            snapshot = self.sim_thread.latest
+            return snapshot.tiles, snapshot.score, snapshot.speed, snapshot.alpha(time.perf_counter())
+        simulation = self.simulation
+        return simulation.tiles, simulation.score.value, simulation.speed, self.timestep.alpha
 
     def _render(self):
+        tiles, score, speed, alpha = self._frame()
+
         if self.game_state == "MENU":
             self.view.draw_start_screen()
 
         elif self.game_state == "PLAYING":
-            self.view.clear_screen()
-            self.view.draw_grid_lines()
-            self.view.draw_tiles(self.tiles)
-            self.view.draw_score(self.score)
-            self.view.draw_speed_indicator(self.speed / 4.0)
+            self.view.draw_tile_strip(tiles, alpha)
+            self.view.draw_score(score)
+            self.view.draw_speed_indicator(speed / 4.0)
 
         elif self.game_state == "PAUSED":
-            self.view.clear_screen()
-            self.view.draw_grid_lines()
-            self.view.draw_tiles(self.tiles)
-            self.view.draw_pause_screen(self.score)
+            self.view.draw_tile_strip(tiles, alpha)
+            self.view.draw_pause_screen(score)
 
         elif self.game_state == "GAME_OVER":
-            self.view.clear_screen()
-            self.view.draw_grid_lines()
-            self.view.draw_tiles(self.tiles)
+            self.view.draw_tile_strip(tiles, alpha)
             self.view.draw_game_over_screen(
-                self.score,
+                score,
                 self.high_score if self.high_score > 0 else None
             )
 
-        self.view.update_display()
+        if self.show_profiler:
+            # Percentiles are recomputed twice a second, not every frame.
+            if self.profiler.frames % 30 == 0 or not self._profiler_lines:
+                self._profiler_lines = [
+                    f"{phase:<7}{p50:>7.2f}{p95:>7.2f}{p99:>7.2f}"
+                    for phase, (p50, p95, p99) in self.profiler.percentiles().items()
+                ]
+                counts = self.input_controller.frame_counts
+                self._profiler_lines.append(
+                    f"{'input':<7}{counts['events']:>5} ev{counts['actions']:>5} act{counts['coalesced']:>4} dup")
+                if self.latency.count():
+                    p50, p95, p99 = self.latency.percentiles()
+                    self._profiler_lines.append(f"{'tap':<7}{p50:>7.2f}{p95:>7.2f}{p99:>7.2f}")
+            self.view.draw_profiler([f"{'ms':<7}{'p50':>7}{'p95':>7}{'p99':>7}"] + self._profiler_lines)
 
 def main():
-    app = PianoTilesApp()
+    render_scale = os.environ.get("PIANO_TILES_RENDER_SCALE", "1")
+    app = PianoTilesApp(profile_path=os.environ.get("PIANO_TILES_PROFILE"),
+                        threaded=os.environ.get("PIANO_TILES_THREADED") == "1",
+                        render_scale=1.0 if render_scale == "auto" else float(render_scale),
+                        auto_render_scale=render_scale == "auto",
+                        scaled_window=os.environ.get("PIANO_TILES_SCALED") == "1")
     app.run()
 
 if __name__ == "__main__":
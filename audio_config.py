@@ -68,19 +68,25 @@ SONGS = {
     'twinkle': {
         'name': 'Estrellita',
         'notes': ['C4', 'C4', 'G4', 'G4'],
-        'description': 'Inspirada en "Twinkle Twinkle Little Star"'
+        'description': 'Inspirada en "Twinkle Twinkle Little Star"',
+        'melody': ['C4', 'C4', 'G4', 'G4', 'A4', 'A4', ('G4', 2),
+                   'F4', 'F4', 'E4', 'E4', 'D4', 'D4', ('C4', 2)]
     },
 
     'ode_to_joy': {
         'name': 'Himno a la Alegría',
         'notes': ['E4', 'E4', 'F4', 'G4'],
-        'description': 'Inspirada en Beethoven - Himno a la Alegría'
+        'description': 'Inspirada en Beethoven - Himno a la Alegría',
+        'melody': ['E4', 'E4', 'F4', 'G4', 'G4', 'F4', 'E4', 'D4',
+                   'C4', 'C4', 'D4', 'E4', ('E4', 1.5), 'D4', ('D4', 2)]
     },
 
     'happy_birthday': {
         'name': 'Cumpleaños Feliz',
         'notes': ['C4', 'C4', 'D4', 'C4'],
-        'description': 'Inspirada en "Happy Birthday"'
+        'description': 'Inspirada en "Happy Birthday"',
+        'melody': ['C4', 'C4', 'D4', 'C4', 'F4', ('E4', 2),
+                   'C4', 'C4', 'D4', 'C4', 'G4', ('F4', 2)]
     },
 
     'bass_rhythm': {
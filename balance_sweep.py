@@ -0,0 +1,131 @@
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.domain.batch_simulation import BatchGameSimulation, PlayerModel
+from src.domain.simulation import SimulationConfig
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def parse_floats(text):
+    return [float(value) for value in text.split(',') if value.strip()]
+
+
+def simulate_chunk(task):
+    params, player, n_games, seed = task
+    config = SimulationConfig(**params)
+    result = BatchGameSimulation(config, player, seed=seed).run(n_games)
+    return params, result.scores, result.survival_ms, result.frames
+
+
+def build_tasks(args):
+    player = PlayerModel(
+        reaction_ms_mean=args.reaction_mean,
+        reaction_ms_std=args.reaction_std,
+        accuracy=args.accuracy,
+    )
+    chunks = max(1, -(-args.games // args.chunk_size))
+    seeds = np.random.SeedSequence(args.seed)
+
+    tasks = []
+    for speed, increment, interval in itertools.product(args.speeds, args.increments, args.intervals):
+        params = {
+            'board_width': args.width,
+            'board_height': args.height,
+            'tile_height': args.tile_height,
+            'base_speed': speed,
+            'speed_increment': increment,
+            'base_spawn_interval': interval,
+        }
+        for chunk in range(chunks):
+            n_games = min(args.chunk_size, args.games - chunk * args.chunk_size)
+            seed = int(seeds.spawn(1)[0].generate_state(1)[0])
+            tasks.append((params, player, n_games, seed))
+    return tasks
+
+
+def summarize(params, scores, survival_ms, frames):
+    row = dict(params)
+    row['games'] = len(scores)
+    row['score_mean'] = round(float(scores.mean()), 3)
+    for q, value in zip(PERCENTILES, np.percentile(scores, PERCENTILES)):
+        row[f'score_p{q}'] = round(float(value), 3)
+    row['survival_ms_mean'] = round(float(survival_ms.mean()), 1)
+    for q, value in zip(PERCENTILES, np.percentile(survival_ms, PERCENTILES)):
+        row[f'survival_ms_p{q}'] = round(float(value), 1)
+    row['frames_p50'] = float(np.median(frames))
+    return row
+
+
+def run_sweep(args):
+    tasks = build_tasks(args)
+    grouped = {}
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for params, scores, survival_ms, frames in pool.map(simulate_chunk, tasks):
+            key = tuple(params.items())
+            grouped.setdefault(key, []).append((scores, survival_ms, frames))
+
+    rows = []
+    for key, parts in grouped.items():
+        rows.append(summarize(
+            dict(key),
+            np.concatenate([p[0] for p in parts]),
+            np.concatenate([p[1] for p in parts]),
+            np.concatenate([p[2] for p in parts]),
+        ))
+    return rows
+
+
+def write_csv(rows, output):
+    if not rows:
+        return
+    handle = open(output, 'w', newline='') if output != '-' else sys.stdout
+    try:
+        writer = csv.DictWriter(handle, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    finally:
+        if handle is not sys.stdout:
+            handle.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Piano Tiles difficulty balancing sweep (headless)")
+    parser.add_argument('--speeds', type=parse_floats, default=[3.0, 4.0, 5.0],
+                        help="starting speeds, comma separated")
+    parser.add_argument('--increments', type=parse_floats, default=[0.1, 0.5],
+                        help="speed increments per spawned row, comma separated")
+    parser.add_argument('--intervals', type=parse_floats, default=[600, 800, 1000],
+                        help="base spawn intervals in ms, comma separated")
+    parser.add_argument('--tile-height', type=int, default=150)
+    parser.add_argument('--width', type=int, default=400)
+    parser.add_argument('--height', type=int, default=600)
+    parser.add_argument('--games', type=int, default=20000, help="games per parameter combination")
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--reaction-mean', type=float, default=350.0)
+    parser.add_argument('--reaction-std', type=float, default=80.0)
+    parser.add_argument('--accuracy', type=float, default=0.995)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='balance_results.csv', help="CSV path, or - for stdout")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = run_sweep(args)
+    write_csv(rows, args.output)
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(rows)} combinations x {args.games} games in {elapsed:.1f}s -> {args.output}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark for the domain entities: per-frame cost and memory per 1000 tiles,
+comparing the slotted, int-coded Tile/Board against the previous dataclass
+and Enum implementation (reproduced below as Legacy*).
+
+Run from the repository root:
+    python -m benchmarks.bench_entities
+"""
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.domain.entities import Board, Tile, BLACK, WHITE
+
+
+class LegacyTileColor(Enum):
+    BLACK = "black"
+    WHITE = "white"
+
+
+@dataclass
+class LegacyTile:
+    x: int
+    y: int
+    width: int
+    height: int
+    color: LegacyTileColor
+    clicked: bool = False
+
+    def is_black(self) -> bool:
+        return self.color == LegacyTileColor.BLACK
+
+
+@dataclass
+class LegacyBoard:
+    width: int
+    height: int
+    columns: int = 4
+    tiles: list = None
+
+    def __post_init__(self):
+        if self.tiles is None:
+            self.tiles = []
+
+    def add_tile(self, tile):
+        self.tiles.append(tile)
+
+    def remove_tile(self, tile):
+        if tile in self.tiles:
+            self.tiles.remove(tile)
+
+
+def legacy_row(y, black_column):
+    # The player taps every row, so no frame ends the game early.
+    return [LegacyTile(i * 100, y, 100, 150,
+                       LegacyTileColor.BLACK if i == black_column else LegacyTileColor.WHITE,
+                       clicked=i == black_column)
+            for i in range(4)]
+
+
+def slotted_row(y, black_column):
+    return [Tile(i * 100, y, 100, 150, BLACK if i == black_column else WHITE,
+                 clicked=i == black_column)
+            for i in range(4)]
+
+
+def frame(board, make_row, rng, bottom):
+    """Move, game over check, cull and spawn, as the tile-list game loop does."""
+    for tile in board.tiles:
+        tile.y += 4
+    for tile in board.tiles:
+        if tile.is_black() and not tile.clicked and tile.y + tile.height >= bottom:
+            break
+    for tile in [t for t in board.tiles if t.y >= bottom]:
+        board.remove_tile(tile)
+    for tile in make_row(0, rng.randint(0, 3)):
+        board.add_tile(tile)
+
+
+def bench_frames(board_cls, make_row, n_tiles, frames=2000):
+    rng = random.Random(0)
+    # Rows 4px apart on a board n_tiles px tall keep n_tiles tiles alive:
+    # every frame one row leaves at the bottom and one spawns at the top.
+    bottom = n_tiles // 4 * 4
+    board = board_cls(width=400, height=bottom)
+    for row in range(n_tiles // 4):
+        for tile in make_row(row * 4, rng.randint(0, 3)):
+            board.add_tile(tile)
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        frame(board, make_row, rng, bottom)
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def bench_memory(make_row, n_tiles=1000):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tiles = [tile for row in range(n_tiles // 4) for tile in make_row(row, row % 4)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del tiles
+    return size
+
+
+def main():
+    print(f"{'implementation':<16}{'tiles':>8}{'us/frame':>12}")
+    for n_tiles in (40, 400, 1000):
+        legacy = bench_frames(LegacyBoard, legacy_row, n_tiles)
+        slotted = bench_frames(Board, slotted_row, n_tiles)
+        print(f"{'legacy':<16}{n_tiles:>8}{legacy:>12.1f}")
+        print(f"{'slotted':<16}{n_tiles:>8}{slotted:>12.1f}")
+
+    print()
+    print(f"{'implementation':<16}{'bytes / 1000 tiles':>20}")
+    print(f"{'legacy':<16}{bench_memory(legacy_row):>20}")
+    print(f"{'slotted':<16}{bench_memory(slotted_row):>20}")
+
+
+if __name__ == "__main__":
+    main()
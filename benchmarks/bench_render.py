@@ -0,0 +1,189 @@
+"""
+Headless rendering benchmark: frame-time percentiles of GameView and the
+PianoTilesApp render path for scripted scenarios, under the SDL dummy video
+driver, written as JSON so runs can be compared.
+
+Run from the repository root:
+    python -m benchmarks.bench_render
+    python -m benchmarks.bench_render --output new.json --baseline bench_render.json
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import PianoTilesApp
+from src.presentation.game_view import Color, GameView
+
+PERCENTILES = (50, 95, 99)
+
+
+def autoplay(simulation):
+    """Tap the lowest unclicked black tile once it is halfway down the board."""
+    tiles = simulation.tiles
+    for y, black_column, clicked in tiles.iter_rows():
+        if not clicked:
+            if y + tiles.tile_height >= simulation.config.board_height // 2:
+                simulation.tap(black_column * tiles.tile_width + tiles.tile_width // 2,
+                               y + tiles.tile_height // 2)
+            return
+
+
+def app_scenario(state, speed=None, warmup_frames=120):
+    """
+    Render path of PianoTilesApp in a given state; playing states advance the
+    simulation one fixed step per frame with an automatic player.
+    """
+    def run(frames, dirty_rects):
+        # Audio loads up front: a loading worker would compete with the
+        # measured frames, and pygame.quit() must not run while it loads.
+        app = PianoTilesApp(seed=0, replay_path=None, dirty_rects=dirty_rects,
+                            background_audio=False)
+        simulation = app.simulation
+        if state != "MENU":
+            app._start_game()
+            for _ in range(warmup_frames):
+                simulation.step()
+                autoplay(simulation)
+        if speed is not None:
+            simulation.speed = speed
+        app.game_state = state
+        # Render halfway between two steps, as a 60 Hz display typically does.
+        app.timestep.accumulator = app.timestep.step_ms / 2
+
+        times = []
+        for _ in range(frames):
+            if state == "PLAYING":
+                simulation.step()
+                autoplay(simulation)
+            start = time.perf_counter()
+            app._render()
+            app.view.update_display()
+            times.append(time.perf_counter() - start)
+        app.view.quit()
+        return times
+    return run
+
+
+def example_tiles(frames, dirty_rects):
+    """Static row of tiles drawn as dicts, as in ejemplo_2_renderizado_tiles."""
+    view = GameView(400, 600, dirty_rects=dirty_rects)
+    tiles = [{'rect': pygame.Rect(x, 100, 100, 150),
+              'color': Color.BLACK if x == 0 else Color.WHITE,
+              'clicked': False}
+             for x in range(0, 400, 100)]
+
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        view.clear_screen()
+        view.draw_grid_lines()
+        view.draw_tiles(tiles)
+        view.update_display()
+        times.append(time.perf_counter() - start)
+    view.quit()
+    return times
+
+
+def example_animation(frames, dirty_rects):
+    """Single falling tile with score, as in ejemplo_3_animacion_tiles."""
+    view = GameView(400, 600, dirty_rects=dirty_rects)
+    tile = {'rect': pygame.Rect(0, -150, 100, 150), 'color': Color.BLACK, 'clicked': False}
+
+    times = []
+    for _ in range(frames):
+        tile['rect'].y = (tile['rect'].y + 5 + 150) % 750 - 150
+        start = time.perf_counter()
+        view.clear_screen()
+        view.draw_grid_lines()
+        view.draw_tiles([tile])
+        view.draw_score(0)
+        view.update_display()
+        times.append(time.perf_counter() - start)
+    view.quit()
+    return times
+
+
+SCENARIOS = {
+    'menu': app_scenario("MENU"),
+    'steady': app_scenario("PLAYING"),
+    'high_speed': app_scenario("PLAYING", speed=16.0),
+    'pause': app_scenario("PAUSED"),
+    'game_over': app_scenario("GAME_OVER"),
+    'example_tiles': example_tiles,
+    'example_animation': example_animation,
+}
+
+
+def summarize(times):
+    ms = np.asarray(times) * 1000
+    result = {'frames': len(ms), 'mean_ms': round(float(ms.mean()), 4)}
+    for q, value in zip(PERCENTILES, np.percentile(ms, PERCENTILES)):
+        result[f'p{q}_ms'] = round(float(value), 4)
+    result['max_ms'] = round(float(ms.max()), 4)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Piano Tiles headless rendering benchmark")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help="scenarios to run, comma separated")
+    parser.add_argument('--frames', type=int, default=600, help="measured frames per scenario")
+    parser.add_argument('--warmup', type=int, default=60, help="unmeasured frames per scenario")
+    parser.add_argument('--dirty-rects', action='store_true', help="use dirty-rect display updates")
+    parser.add_argument('--output', default='bench_render.json', help="JSON path, or - for stdout")
+    parser.add_argument('--baseline', help="previous JSON output to compare p50/p95/p99 against")
+    args = parser.parse_args()
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'sdl': '.'.join(map(str, pygame.get_sdl_version())),
+            'video_driver': os.environ["SDL_VIDEODRIVER"],
+            'dirty_rects': args.dirty_rects,
+            'frames': args.frames,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'scenarios': {},
+    }
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['scenarios']
+
+    for name in args.scenarios.split(','):
+        times = SCENARIOS[name](args.warmup + args.frames, args.dirty_rects)[args.warmup:]
+        summary = summarize(times)
+        results['scenarios'][name] = summary
+        print(f"{name:<20}p50 {summary['p50_ms']:>8.3f} ms  p95 {summary['p95_ms']:>8.3f} ms  "
+              f"p99 {summary['p99_ms']:>8.3f} ms", file=sys.stderr)
+        if name in baseline:
+            deltas = [f"p{q} {(summary[f'p{q}_ms'] / baseline[name][f'p{q}_ms'] - 1) * 100:+.1f}%"
+                      for q in PERCENTILES]
+            print(f"{'  vs baseline':<20}{'  '.join(deltas)}", file=sys.stderr)
+
+    text = json.dumps(results, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark for note synthesis: time to build a whole note table, comparing
+the batched float32 PianoNoteGenerator.synthesize_bank against the previous
+one-note-at-a-time float64 path (reproduced below as legacy_note).
+
+Run from the repository root:
+    python -m benchmarks.bench_synthesis
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from audio_config import NOTE_FREQUENCIES
+from src.infrastructure.pygame_audio import PianoNoteGenerator
+
+
+def legacy_note(generator, frequency, duration):
+    n_samples = int(generator.sample_rate * duration)
+    t = np.linspace(0, duration, n_samples, False)
+    wave = np.zeros_like(t)
+    for harmonic, amplitude in enumerate(generator.HARMONICS, 1):
+        wave += amplitude * np.sin(2 * np.pi * frequency * harmonic * t)
+    wave = wave / np.max(np.abs(wave))
+    wave = wave * generator._create_adsr_envelope(n_samples, duration)
+    wave = np.int16(wave * 32767)
+    return np.column_stack((wave, wave))
+
+
+def best_ms(fn, repeats=20):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    frequencies = list(NOTE_FREQUENCIES.values())
+    print(f"{len(frequencies)} notes from audio_config.NOTE_FREQUENCIES")
+    print(f"{'duration':>8}{'per-note ms':>14}{'bank ms':>10}{'bank+stereo ms':>16}{'max diff':>10}")
+
+    for duration in (0.3, 0.4, 0.8):
+        generator = PianoNoteGenerator()
+        per_note = best_ms(lambda: [legacy_note(generator, f, duration) for f in frequencies])
+        bank = best_ms(lambda: generator.synthesize_bank(frequencies, duration))
+        stereo = best_ms(lambda: generator.waveforms(frequencies, duration))
+
+        legacy = np.stack([legacy_note(generator, f, duration)[:, 0] for f in frequencies])
+        diff = np.abs(legacy.astype(np.int32) - generator.synthesize_bank(frequencies, duration)).max()
+        print(f"{duration:>8}{per_note:>14.2f}{bank:>10.2f}{stereo:>16.2f}{diff:>10}")
+
+
+if __name__ == "__main__":
+    main()
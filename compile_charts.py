@@ -0,0 +1,35 @@
+import os
+import sys
+
+from src.domain.chart import compile_chart
+from audio_config import SONGS, NOTE_FREQUENCIES
+
+CHARTS_DIR = "charts"
+
+
+def chart_path(song_id, charts_dir=CHARTS_DIR):
+    return os.path.join(charts_dir, f"{song_id}.chart")
+
+
+def compile_all(charts_dir=CHARTS_DIR):
+    os.makedirs(charts_dir, exist_ok=True)
+
+    for song_id, song in SONGS.items():
+        if 'melody' not in song:
+            continue
+
+        data = compile_chart(song, NOTE_FREQUENCIES)
+        with open(chart_path(song_id, charts_dir), 'wb') as f:
+            f.write(data)
+
+        print(f"   {song_id:15} | {len(song['melody']):4} filas | {len(data):6} bytes")
+
+
+def main():
+    charts_dir = sys.argv[1] if len(sys.argv) > 1 else CHARTS_DIR
+    print(f"🎼 Compilando charts en '{charts_dir}/'")
+    compile_all(charts_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,19 @@ coordinating between the domain layer and infrastructure layer.
 from .start_game import StartGameUseCase
 from .update_game import UpdateGameUseCase
 from .submit_score import SubmitScoreUseCase
+from .fixed_timestep import FixedTimestep
+from .frame_profiler import FrameProfiler, NullFrameProfiler
+from .simulation_thread import FrameSnapshot, SimulationThread
+from .latency_tracker import LatencyTracker
 
 __all__ = [
     'StartGameUseCase',
     'UpdateGameUseCase', 
     'SubmitScoreUseCase',
+    'FixedTimestep',
+    'FrameProfiler',
+    'NullFrameProfiler',
+    'FrameSnapshot',
+    'SimulationThread',
+    'LatencyTracker',
 ]
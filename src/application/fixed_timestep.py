@@ -0,0 +1,36 @@
+
+
+class FixedTimestep:
+    """
+    Accumulator that turns variable frame times into fixed simulation steps.
+    """
+
+    def __init__(self, step_ms: float = 1000 / 60, max_steps: int = 5):
+        self.step_ms = step_ms
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def reset(self):
+        self.accumulator = 0.0
+
+    def advance(self, elapsed_ms: float) -> int:
+        """
+        Add elapsed wall time and return how many fixed steps to run now.
+
+        At most max_steps are returned per call; time beyond that is dropped
+        so a long stall slows the game down instead of fast-forwarding it.
+        """
+        self.accumulator += elapsed_ms
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = self.step_ms * steps
+        self.accumulator -= steps * self.step_ms
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """
+        Fraction of a step left in the accumulator, for render interpolation.
+        """
+        return self.accumulator / self.step_ms
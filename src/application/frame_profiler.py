@@ -0,0 +1,89 @@
+import json
+import time
+import numpy as np
+from typing import Dict, Sequence, Tuple
+
+PHASES = ('events', 'update', 'render', 'flip', 'sleep')
+
+
+class FrameProfiler:
+    """
+    Per-phase frame timing kept in fixed-size ring buffers.
+
+    The game loop calls begin_frame() once, then mark(phase) after each
+    phase; mark records the time since the previous mark. Only the last
+    capacity frames are kept, so memory is fixed however long it runs.
+    """
+
+    def __init__(self, capacity: int = 1200, phases: Sequence[str] = PHASES):
+        self.phases = tuple(phases)
+        self.capacity = capacity
+        self._index = {phase: i for i, phase in enumerate(self.phases)}
+        self._samples = np.zeros((len(self.phases), capacity), dtype=np.float64)
+        self.frames = 0
+        self._slot = 0
+        self._last = 0.0
+
+    def begin_frame(self):
+        self._slot = self.frames % self.capacity
+        self._samples[:, self._slot] = 0.0
+        self._last = time.perf_counter()
+
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        self._samples[self._index[phase], self._slot] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        self.frames += 1
+
+    def percentiles(self, q: Sequence[float] = (50, 95, 99)) -> Dict[str, Tuple[float, ...]]:
+        """
+        Return {phase: percentiles in ms} over the buffered frames, including
+        a 'frame' entry for the whole frame.
+        """
+        count = min(self.frames, self.capacity)
+        if count == 0:
+            return {}
+        samples = self._samples[:, :count] * 1000
+        rows = np.vstack([samples, samples.sum(axis=0)])
+        values = np.percentile(rows, q, axis=1).T
+        return {phase: tuple(round(float(v), 3) for v in row)
+                for phase, row in zip(self.phases + ('frame',), values)}
+
+    def to_dict(self) -> dict:
+        count = min(self.frames, self.capacity)
+        # Oldest first, so the dump reads in frame order after a wrap.
+        order = (np.arange(count) + (self.frames - count)) % self.capacity
+        return {
+            'frames': self.frames,
+            'buffered': count,
+            'percentiles_ms': {phase: dict(zip(('p50', 'p95', 'p99'), values))
+                               for phase, values in self.percentiles().items()},
+            'samples_ms': {phase: np.round(self._samples[i, order] * 1000, 4).tolist()
+                           for i, phase in enumerate(self.phases)},
+        }
+
+    def dump(self, path: str, **sections):
+        """
+        Write to_dict() as JSON, with any extra top-level sections.
+        """
+        with open(path, 'w') as f:
+            json.dump({**self.to_dict(), **sections}, f)
+
+
+class NullFrameProfiler:
+    """
+    Stand-in used when profiling is off: every call is a no-op.
+    """
+
+    frames = 0
+
+    def begin_frame(self):
+        pass
+
+    def mark(self, phase: str):
+        pass
+
+    def end_frame(self):
+        pass
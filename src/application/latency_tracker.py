@@ -0,0 +1,65 @@
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, List, Sequence, Tuple
+
+# Upper bucket edges in ms; the last bucket counts everything above.
+BUCKETS_MS = (0.25, 0.5, 1, 2, 4, 8, 16, 32, 64, 128)
+
+# Spans measured for each tap, from the input event to the note dispatch.
+SPANS = ('event_to_hit_test', 'hit_test_to_dispatch', 'event_to_dispatch')
+
+
+class LatencyTracker:
+    """
+    Histograms of tap latency: input event -> hit test -> note dispatch.
+
+    Times are time.perf_counter() seconds, the clock the input events are
+    stamped with. Each span keeps bucket counts over the whole session
+    plus the last `keep` samples for percentiles.
+    """
+
+    def __init__(self, keep: int = 1000, buckets_ms: Sequence[float] = BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._counts = {span: [0] * (len(self.buckets_ms) + 1) for span in SPANS}
+        self._recent = {span: deque(maxlen=keep) for span in SPANS}
+
+    def _add(self, span: str, seconds: float):
+        ms = seconds * 1000
+        self._counts[span][bisect_left(self.buckets_ms, ms)] += 1
+        self._recent[span].append(ms)
+
+    def record(self, event_time: float, hit_test_time: float, dispatch_time: float):
+        self._add('event_to_hit_test', hit_test_time - event_time)
+        self._add('hit_test_to_dispatch', dispatch_time - hit_test_time)
+        self._add('event_to_dispatch', dispatch_time - event_time)
+
+    def count(self, span: str = 'event_to_dispatch') -> int:
+        return sum(self._counts[span])
+
+    def histogram(self, span: str = 'event_to_dispatch') -> List[Tuple[float, int]]:
+        """
+        Return [(upper edge ms, count)], with inf as the last edge.
+        """
+        return list(zip(self.buckets_ms + (float('inf'),), self._counts[span]))
+
+    def percentiles(self, span: str = 'event_to_dispatch',
+                    q: Sequence[float] = (50, 95, 99)) -> Tuple[float, ...]:
+        """
+        Percentiles in ms over the recent samples (nearest rank), or () if none.
+        """
+        samples = sorted(self._recent[span])
+        if not samples:
+            return ()
+        return tuple(samples[min(len(samples) - 1, int(len(samples) * p / 100))] for p in q)
+
+    def to_dict(self) -> Dict[str, dict]:
+        return {
+            span: {
+                'count': self.count(span),
+                'percentiles_ms': dict(zip(('p50', 'p95', 'p99'), self.percentiles(span))),
+                # JSON has no infinity: the open-ended last bucket gets a null edge.
+                'histogram_ms': [[edge if edge != float('inf') else None, count]
+                                 for edge, count in self.histogram(span)],
+            }
+            for span in SPANS
+        }
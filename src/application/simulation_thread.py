@@ -0,0 +1,183 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from queue import Empty, SimpleQueue
+from typing import Callable, Optional
+
+from ..domain.replay import ReplayRecorder
+from ..domain.simulation import GameSimulation
+from ..domain.tile_store import TileRowSnapshot
+
+# Commands are (kind, timestamp in clock seconds, argument).
+START = 'start'
+PAUSE = 'pause'
+TAP = 'tap'
+STOP = 'stop'
+
+
+@dataclass(frozen=True)
+class FrameSnapshot:
+    """
+    Immutable state of the simulation after a step, published for rendering.
+    replay holds the encoded replay of the session once it is over.
+    """
+    session: int
+    tiles: TileRowSnapshot
+    score: int
+    speed: float
+    game_over: bool
+    step_time: float
+    step_ms: float
+    replay: Optional[bytes] = None
+
+    def alpha(self, now: float) -> float:
+        """
+        Interpolation factor for rendering at clock time now.
+        """
+        return min(1.0, max(0.0, (now - self.step_time) * 1000 / self.step_ms))
+
+
+class SimulationThread:
+    """
+    Runs a GameSimulation on its own thread at a fixed rate.
+
+    The render thread sends timestamped commands through a queue and reads
+    `latest`, a FrameSnapshot replaced wholesale after every change, so
+    neither side takes a lock per frame. Taps are applied in timestamp
+    order between the steps they fall between; their outcomes come back on
+    `results` as (TapResult, column, tap timestamp, hit-test time, score
+    after the tap), ahead of the snapshot that includes them. The
+    simulation must not be touched by other threads while this one runs.
+    """
+
+    def __init__(self, simulation: GameSimulation, max_steps: int = 5,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.simulation = simulation
+        self.step_ms = simulation.config.frame_ms
+        self.max_steps = max_steps
+        self.clock = clock
+
+        self.commands: SimpleQueue = SimpleQueue()
+        self.results: SimpleQueue = SimpleQueue()
+        self.session = 0
+        self.latest: Optional[FrameSnapshot] = None
+
+        self._session = 0
+        self._replay: Optional[bytes] = None
+        self._playing = False
+        self._paused = False
+        self._pending = deque()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+
+    def start(self):
+        self._publish(self.clock())
+        self._thread.start()
+
+    def stop(self):
+        self.commands.put((STOP, self.clock(), None))
+        self._thread.join()
+
+    def start_session(self, start_time: float = 0) -> int:
+        """
+        Reset the simulation for a new game and return its session number;
+        snapshots of older sessions keep their old number.
+        """
+        self.session += 1
+        self.commands.put((START, self.clock(), (self.session, start_time)))
+        return self.session
+
+    def set_paused(self, paused: bool):
+        self.commands.put((PAUSE, self.clock(), paused))
+
+    def tap(self, x: float, y: float, timestamp: Optional[float] = None):
+        self.commands.put((TAP, self.clock() if timestamp is None else timestamp, (x, y)))
+
+    def _publish(self, step_time: float):
+        simulation = self.simulation
+        # Encoded here, once: the recorder belongs to this thread.
+        if simulation.game_over and self._replay is None and simulation.recorder is not None:
+            self._replay = simulation.recorder.to_bytes()
+        self.latest = FrameSnapshot(
+            session=self._session,
+            tiles=simulation.tiles.snapshot(),
+            score=simulation.score.value,
+            speed=simulation.speed,
+            game_over=simulation.game_over,
+            step_time=step_time,
+            step_ms=self.step_ms,
+            replay=self._replay,
+        )
+
+    def _active(self) -> bool:
+        return self._playing and not self._paused and not self.simulation.game_over
+
+    def _apply(self, command) -> bool:
+        kind, timestamp, argument = command
+        simulation = self.simulation
+
+        if kind == TAP:
+            if self._active():
+                result, column = simulation.tap(*argument)
+                self.results.put((result, column, timestamp, self.clock(), simulation.score.value))
+        elif kind == START:
+            self._session, start_time = argument
+            self._replay = None
+            simulation.reset(start_time=start_time)
+            ReplayRecorder.attach(simulation)
+            simulation.spawn_row()
+            self._playing = True
+            self._paused = False
+        elif kind == PAUSE:
+            self._paused = argument
+        elif kind == STOP:
+            return False
+        return True
+
+    def _apply_until(self, limit: float) -> bool:
+        pending = self._pending
+        while pending and pending[0][1] < limit:
+            if not self._apply(pending.popleft()):
+                return False
+        return True
+
+    def _run(self):
+        step_s = self.step_ms / 1000
+        next_step = self.clock() + step_s
+        last_step_time = self.clock()
+
+        while True:
+            # Sleep until the next step is due, or until a command arrives;
+            # with nothing to step, wait for commands only.
+            active = self._active()
+            try:
+                timeout = max(0.0, next_step - self.clock()) if active else None
+                self._pending.append(self.commands.get(timeout=timeout))
+                while True:
+                    self._pending.append(self.commands.get_nowait())
+            except Empty:
+                pass
+
+            now = self.clock()
+            if not active:
+                next_step = now + step_s
+            changed = bool(self._pending)
+
+            steps = 0
+            while next_step <= now:
+                if not self._apply_until(next_step):
+                    return
+                if self._active():
+                    self.simulation.step()
+                    last_step_time = next_step
+                    steps += 1
+                next_step += step_s
+                if steps == self.max_steps:
+                    # Drop the backlog, as FixedTimestep does, instead of fast-forwarding.
+                    next_step = now + step_s
+                    break
+
+            if not self._apply_until(float('inf')):
+                return
+            if changed or steps:
+                self._publish(last_step_time)
@@ -1,8 +1,9 @@
 
-
+import random
+from typing import Optional
 from ..domain.ports import AudioPort, ClockPort, LeaderboardPort
-from ..domain.entities import GameState, Score, Board
-from ..domain.services import TileGeneratorService
+from ..domain.entities import GameState
+from ..domain.simulation import GameSimulation, SimulationConfig
 
 
 class StartGameUseCase:
@@ -10,12 +11,14 @@ class StartGameUseCase:
     Use case for starting a new game.
     """
 
-    def __init__(self, audio_port: AudioPort, clock_port: ClockPort, leaderboard_port: LeaderboardPort):
+    def __init__(self, audio_port: AudioPort, clock_port: ClockPort, leaderboard_port: LeaderboardPort,
+                 rng: Optional[random.Random] = None):
         self.audio_port = audio_port
         self.clock_port = clock_port
         self.leaderboard_port = leaderboard_port
+        self.rng = rng or random.Random()
 
-    def execute(self, board_width: int = 400, board_height: int = 600) -> dict:
+    def execute(self, board_width: int = 400, board_height: int = 600, seed: Optional[int] = None) -> dict:
         """
         Start a new game.
         """
@@ -23,17 +26,26 @@ class StartGameUseCase:
         self.audio_port.stop_all_sounds()
         
         high_score = self.leaderboard_port.get_high_score() or 0
+
+        config = SimulationConfig(board_width=board_width, board_height=board_height,
+                                  tile_height=board_height // 4)
+        simulation = GameSimulation(config, rng=self.rng)
+        simulation.reset(start_time=self.clock_port.get_current_time(), seed=seed)
+        # Restart delta timing so the first update does not include menu time.
+        self.clock_port.get_delta_time()
         
         game_state = {
             'state': GameState.PLAYING,
-            'score': Score(),
-            'board': Board(width=board_width, height=board_height),
-            'tiles': [],
-            'speed': 4.0,
+            'simulation': simulation,
+            'score': simulation.score,
+            'board': simulation.board,
+            'tiles': simulation.tiles,
+            'speed': simulation.speed,
             'high_score': high_score,
-            'last_spawn_time': self.clock_port.get_current_time(),
-            'base_spawn_interval': 800,
-            'base_speed': 4.0
+            'last_spawn_time': simulation.last_spawn_time,
+            'base_spawn_interval': config.base_spawn_interval,
+            'base_speed': config.base_speed,
+            'alpha': 1.0
         }
         
         return game_state
\ No newline at end of file
@@ -0,0 +1,140 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Optional
+from .simulation import SimulationConfig
+
+
+@dataclass
+class PlayerModel:
+    """
+    Synthetic player: taps each row once it is fully visible, after a
+    normally distributed reaction time, and hits the wrong tile with
+    probability 1 - accuracy.
+    """
+    reaction_ms_mean: float = 350.0
+    reaction_ms_std: float = 80.0
+    reaction_ms_min: float = 120.0
+    accuracy: float = 0.995
+
+
+@dataclass
+class BatchResult:
+    survival_ms: np.ndarray
+    scores: np.ndarray
+    frames: np.ndarray
+
+    def percentiles(self, q=(5, 25, 50, 75, 95)) -> dict:
+        return {
+            'score': dict(zip(q, np.percentile(self.scores, q).tolist())),
+            'survival_ms': dict(zip(q, np.percentile(self.survival_ms, q).tolist())),
+        }
+
+
+class BatchGameSimulation:
+    """
+    Steps many independent games at once as (game x row) NumPy arrays.
+
+    The rules are those of GameSimulation: every frame rows move by the
+    game's speed, leave at the bottom, end the game if an unclicked black
+    tile reaches the bottom, and a new row spawns once
+    base_spawn_interval * base_speed / speed milliseconds have passed,
+    raising the speed by speed_increment.
+    """
+
+    def __init__(self, config: Optional[SimulationConfig] = None,
+                 player: Optional[PlayerModel] = None, seed: Optional[int] = None):
+        self.config = config or SimulationConfig()
+        self.player = player or PlayerModel()
+        self.rng = np.random.default_rng(seed)
+
+        # Rows always spawn base_speed * base_spawn_interval / frame_ms pixels
+        # apart, since the interval shrinks exactly as the speed grows.
+        cfg = self.config
+        spacing = cfg.base_speed * cfg.base_spawn_interval / cfg.frame_ms
+        self.row_capacity = int(np.ceil((cfg.board_height + cfg.tile_height) / spacing)) + 4
+
+    def run(self, n_games: int, max_frames: int = 20000) -> BatchResult:
+        cfg = self.config
+        player = self.player
+        rng = self.rng
+        rows = self.row_capacity
+        miss_line = np.float32(cfg.board_height - cfg.tile_height)
+        spawn_budget = cfg.base_spawn_interval * cfg.base_speed
+
+        survival_ms = np.zeros(n_games, dtype=np.float64)
+        scores = np.zeros(n_games, dtype=np.int64)
+        frames = np.zeros(n_games, dtype=np.int64)
+
+        # Row arrays are laid out (row x game) so per-game reductions over rows
+        # run along contiguous memory. Every game shares the frame clock, so
+        # time is a scalar. Only pending rows (spawned, not yet tapped) matter
+        # for the rules, so empty and tapped slots sit at y = -inf with an
+        # infinite tap time, and the game over check is a single max().
+        game_id = np.arange(n_games)
+        running = np.ones(n_games, dtype=bool)
+        last_spawn = np.zeros(n_games, dtype=np.float64)
+        speed = np.full(n_games, cfg.base_speed, dtype=np.float32)
+        score = np.zeros(n_games, dtype=np.int64)
+        head = np.zeros(n_games, dtype=np.int64)
+        next_due = np.full(n_games, np.inf, dtype=np.float32)
+        y = np.full((rows, n_games), -np.inf, dtype=np.float32)
+        due = np.full((rows, n_games), np.inf, dtype=np.float32)
+
+        frame = 0
+        while len(game_id) and frame < max_frames:
+            frame += 1
+            time = frame * cfg.frame_ms
+            over = np.zeros(len(game_id), dtype=bool)
+
+            # Player input for this frame, applied before the update like the app loop.
+            tapping = np.flatnonzero(next_due <= time)
+            if len(tapping):
+                ri, k = np.nonzero(due[:, tapping] <= time)
+                gi = tapping[k]
+                due[ri, gi] = np.inf
+                y[ri, gi] = -np.inf
+                next_due[tapping] = due[:, tapping].min(axis=0)
+                wrong = rng.random(len(gi)) > player.accuracy
+                score += np.bincount(gi[~wrong], minlength=len(game_id))
+                over[gi[wrong]] = True
+
+            y += speed
+            over |= y.max(axis=0) >= miss_line
+            over &= running
+
+            gi = np.flatnonzero(running & ~over & (time - last_spawn > spawn_budget / speed))
+            if len(gi):
+                slot = head[gi] % rows
+                if (due[slot, gi] < np.inf).any():
+                    raise ValueError("row capacity exceeded; spawn spacing is smaller than expected")
+                speed[gi] += cfg.speed_increment
+                # The player reacts once the row has moved fully on screen.
+                visible = np.ceil(cfg.tile_height / speed[gi]) * cfg.frame_ms
+                reaction = rng.normal(player.reaction_ms_mean, player.reaction_ms_std, len(gi))
+                y[slot, gi] = -cfg.tile_height
+                due[slot, gi] = time + visible + np.maximum(reaction, player.reaction_ms_min)
+                next_due[gi] = np.minimum(next_due[gi], due[slot, gi])
+                head[gi] += 1
+                last_spawn[gi] = time
+
+            if frame == max_frames:
+                over |= running
+
+            if over.any():
+                done = game_id[over]
+                survival_ms[done] = time
+                scores[done] = score[over]
+                frames[done] = frame
+                running &= ~over
+                y[:, over] = -np.inf
+                due[:, over] = np.inf
+                next_due[over] = np.inf
+
+                # Drop finished games in batches so the copy is amortized.
+                if np.count_nonzero(running) * 4 < len(game_id) * 3:
+                    keep = running
+                    game_id, running, last_spawn, speed, score, head, next_due = (
+                        a[keep] for a in (game_id, running, last_spawn, speed, score, head, next_due))
+                    y, due = y[:, keep], due[:, keep]
+
+        return BatchResult(survival_ms=survival_ms, scores=scores, frames=frames)
@@ -0,0 +1,101 @@
+import hashlib
+import struct
+from typing import Dict, Iterator, List, Optional, Tuple
+
+MAGIC = b'PTCH'
+VERSION = 1
+
+# magic, version, note table size, row count; then the note table as 3-byte
+# ASCII names, then one ROW record per spawned row.
+HEADER = struct.Struct('<4sBBI')
+NOTE_NAME = struct.Struct('3s')
+# column, note index, ms until the next row, absolute speed x100 (0 = keep ramp)
+ROW = struct.Struct('<BBHH')
+# Bytes of the chart's SHA-256 kept as its digest.
+DIGEST_SIZE = 8
+
+
+def _pick_column(note: str, columns: List[str], frequencies: Dict[str, float], previous: int) -> int:
+    target = frequencies[note]
+    distances = [abs(frequencies[column_note] - target) for column_note in columns]
+    best = min(distances)
+    candidates = [i for i, d in enumerate(distances) if d == best]
+    # Repeated notes alternate between columns playing the same note.
+    for column in candidates:
+        if column != previous:
+            return column
+    return candidates[0]
+
+
+def compile_chart(song: dict, note_frequencies: Dict[str, float]) -> bytes:
+    """
+    Compile a song definition into a binary chart.
+
+    The song provides the four column notes ('notes'), the melody as note
+    names or (note, beats) pairs, an optional 'bpm' (75 by default, one beat
+    per 800 ms spawn) and optional 'speed_changes' {row index: speed}.
+    Each melody note goes to the column whose note is closest in pitch.
+    At the default board, beats shorter than about 0.8 make rows overlap.
+    """
+    if not song['melody']:
+        raise ValueError("a chart needs at least one melody note")
+
+    columns = song['notes']
+    beat_ms = 60000 / song.get('bpm', 75)
+    speed_changes = song.get('speed_changes', {})
+    note_table = list(note_frequencies)
+
+    rows = bytearray()
+    previous = -1
+    for index, entry in enumerate(song['melody']):
+        note, beats = (entry, 1) if isinstance(entry, str) else entry
+        column = _pick_column(note, columns, note_frequencies, previous)
+        speed = int(round(speed_changes.get(index, 0) * 100))
+        rows += ROW.pack(column, note_table.index(note), int(round(beats * beat_ms)), speed)
+        previous = column
+
+    header = HEADER.pack(MAGIC, VERSION, len(note_table), len(rows) // ROW.size)
+    names = b''.join(NOTE_NAME.pack(name.encode('ascii')) for name in note_table)
+    return header + names + bytes(rows)
+
+
+class Chart:
+    """
+    Read-only view over a compiled chart. Rows are decoded lazily from the
+    underlying buffer, so loading is a single read and spawning decodes one
+    fixed-size record at a time.
+    """
+
+    def __init__(self, data: bytes):
+        magic, version, n_notes, n_rows = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a Piano Tiles chart")
+        if n_rows == 0:
+            raise ValueError("chart has no rows")
+
+        names_end = HEADER.size + n_notes * NOTE_NAME.size
+        self.note_names = [name.rstrip(b'\0').decode('ascii')
+                           for (name,) in NOTE_NAME.iter_unpack(data[HEADER.size:names_end])]
+        self.row_count = n_rows
+        self._rows = memoryview(data)[names_end:names_end + n_rows * ROW.size]
+        # Identifies the chart in replays, which need the same chart to play.
+        self.digest = hashlib.sha256(data[:names_end + n_rows * ROW.size]).digest()[:DIGEST_SIZE]
+
+    @classmethod
+    def load(cls, path: str) -> 'Chart':
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def iter_rows(self) -> Iterator[Tuple[int, int, int, int]]:
+        """
+        Yield (column, note index, interval ms, speed x100) per row.
+        """
+        return ROW.iter_unpack(self._rows)
+
+    def note_name(self, note_index: int) -> Optional[str]:
+        if 0 <= note_index < len(self.note_names):
+            return self.note_names[note_index]
+        return None
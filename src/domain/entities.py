@@ -1,26 +1,30 @@
 
 from dataclasses import dataclass
 from typing import Tuple
-from enum import Enum
+from enum import Enum, IntEnum
 
-class TileColor(Enum):
-    BLACK = "black"
-    WHITE = "white"
+class TileColor(IntEnum):
+    WHITE = 0
+    BLACK = 1
 
-@dataclass
+# Plain int codes for hot paths; comparing ints avoids Enum member lookups.
+WHITE = int(TileColor.WHITE)
+BLACK = int(TileColor.BLACK)
+
+@dataclass(slots=True, eq=False)
 class Tile:
     x: int
     y: int
     width: int
     height: int
-    color: TileColor
+    color: int
     clicked: bool = False
 
     def is_black(self) -> bool:
-        return self.color == TileColor.BLACK
+        return self.color == BLACK
 
     def is_white(self) -> bool:
-        return self.color == TileColor.WHITE
+        return self.color == WHITE
 
     def mark_as_clicked(self):
         self.clicked = True
@@ -29,7 +33,7 @@ class Tile:
         return (self.x <= x <= self.x + self.width and
                 self.y <= y <= self.y + self.height)
 
-@dataclass
+@dataclass(slots=True)
 class Score:
     value: int = 0
     player_name: str = "Player"
@@ -61,8 +65,14 @@ class Board:
         self.tiles.append(tile)
 
     def remove_tile(self, tile: Tile):
-        if tile in self.tiles:
+        # Tiles compare by identity, so this is a single C-level scan.
+        try:
             self.tiles.remove(tile)
+        except ValueError:
+            pass
+
+    def remove_tile_at(self, index: int):
+        del self.tiles[index]
 
     def clear_tiles(self):
         self.tiles.clear()
@@ -0,0 +1,203 @@
+import struct
+from dataclasses import dataclass, astuple
+from typing import Iterator, Optional, Tuple
+from .chart import Chart, DIGEST_SIZE
+from .simulation import GameSimulation, SimulationConfig
+
+MAGIC = b'PTRP'
+VERSION = 3
+
+# magic, version, seed, start time, chart digest (NO_CHART without one), then
+# the SimulationConfig fields in order.
+HEADER = struct.Struct(f'<4sBQd{DIGEST_SIZE}sHHHHdddd')
+NO_CHART = bytes(DIGEST_SIZE)
+
+# Each event starts with a varint tag = (payload << 3) | kind. Times and
+# coordinates that are not whole numbers are stored as exact float64 values,
+# so a replay feeds the simulation exactly the inputs of the live game.
+TICK_AT = 0     # payload: zigzag(whole ms since the previous tick), step(current_time)
+FRAMES = 1      # payload: number of consecutive step() calls on the frame clock
+TAP = 2         # payload: zigzag(x), followed by a varint zigzag(y)
+SPAWN = 3       # payload: unused, an explicit spawn_row()
+TICK_EXACT = 4  # payload: unused, followed by current_time as float64
+TAP_EXACT = 5   # payload: unused, followed by x and y as float64
+KIND_BITS = 3
+KIND_MASK = (1 << KIND_BITS) - 1
+
+FLOAT = struct.Struct('<d')
+POINT = struct.Struct('<dd')
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+class ReplayRecorder:
+    """
+    Records the inputs of one GameSimulation session as a compact binary
+    stream: a fixed header (seed, start time, chart, config) followed by
+    delta-encoded, varint-packed tick and tap events.
+    """
+
+    def __init__(self, config: SimulationConfig, seed: int, start_time: float = 0,
+                 chart: Optional[Chart] = None):
+        self._header = HEADER.pack(MAGIC, VERSION, seed, start_time,
+                                   chart.digest if chart else NO_CHART, *astuple(config))
+        self._events = bytearray()
+        self._last_tick = start_time
+        self._pending_frames = 0
+
+    @classmethod
+    def attach(cls, simulation: GameSimulation) -> 'ReplayRecorder':
+        """
+        Start recording the current session of a freshly reset simulation.
+        """
+        recorder = cls(simulation.config, simulation.seed, simulation.time, simulation.chart)
+        simulation.recorder = recorder
+        return recorder
+
+    def _flush_frames(self):
+        if self._pending_frames:
+            _write_varint(self._events, (self._pending_frames << KIND_BITS) | FRAMES)
+            self._pending_frames = 0
+
+    def record_step(self, current_time: Optional[float], time: float):
+        if current_time is None:
+            self._pending_frames += 1
+        else:
+            self._flush_frames()
+            delta = current_time - self._last_tick
+            # Whole-ms deltas that add back up to exactly current_time are
+            # stored compactly; anything else as the exact time.
+            if float(delta).is_integer() and self._last_tick + int(delta) == current_time:
+                _write_varint(self._events, (_zigzag(int(delta)) << KIND_BITS) | TICK_AT)
+            else:
+                _write_varint(self._events, TICK_EXACT)
+                self._events += FLOAT.pack(current_time)
+        self._last_tick = time
+
+    def record_spawn(self):
+        self._flush_frames()
+        _write_varint(self._events, SPAWN)
+
+    def record_tap(self, x: float, y: float):
+        self._flush_frames()
+        if float(x).is_integer() and float(y).is_integer():
+            _write_varint(self._events, (_zigzag(int(x)) << KIND_BITS) | TAP)
+            _write_varint(self._events, _zigzag(int(y)))
+        else:
+            _write_varint(self._events, TAP_EXACT)
+            self._events += POINT.pack(x, y)
+
+    def to_bytes(self) -> bytes:
+        self._flush_frames()
+        return self._header + bytes(self._events)
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+
+@dataclass
+class Replay:
+    seed: int
+    start_time: float
+    config: SimulationConfig
+    events: bytes
+    chart_digest: bytes = NO_CHART
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Replay':
+        fields = HEADER.unpack_from(data)
+        magic, version, seed, start_time, chart_digest = fields[:5]
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a Piano Tiles replay")
+        return cls(seed=seed, start_time=start_time, config=SimulationConfig(*fields[5:]),
+                   events=data[HEADER.size:], chart_digest=chart_digest)
+
+    @classmethod
+    def load(cls, path: str) -> 'Replay':
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def iter_events(self) -> Iterator[Tuple[int, float, float]]:
+        """
+        Yield (kind, a, b): (TICK_AT, delta_ms, 0), (TICK_EXACT, time, 0),
+        (FRAMES, count, 0), (TAP or TAP_EXACT, x, y) or (SPAWN, 0, 0).
+        """
+        data = self.events
+        pos = 0
+        while pos < len(data):
+            tag, pos = _read_varint(data, pos)
+            kind, payload = tag & KIND_MASK, tag >> KIND_BITS
+            if kind == TAP:
+                y, pos = _read_varint(data, pos)
+                yield TAP, _unzigzag(payload), _unzigzag(y)
+            elif kind == TICK_AT:
+                yield TICK_AT, _unzigzag(payload), 0
+            elif kind == TICK_EXACT:
+                (time,) = FLOAT.unpack_from(data, pos)
+                pos += FLOAT.size
+                yield TICK_EXACT, time, 0
+            elif kind == TAP_EXACT:
+                x, y = POINT.unpack_from(data, pos)
+                pos += POINT.size
+                yield TAP_EXACT, x, y
+            else:
+                yield kind, payload, 0
+
+    def play(self, chart: Optional[Chart] = None) -> GameSimulation:
+        """
+        Re-run the session headlessly and return the finished simulation.
+        Sessions recorded with a chart must be played with the same chart;
+        a missing or different chart raises ValueError.
+        """
+        if (chart.digest if chart else NO_CHART) != self.chart_digest:
+            if self.chart_digest == NO_CHART:
+                raise ValueError("replay was recorded without a chart")
+            raise ValueError("replay was recorded with a different chart")
+        simulation = GameSimulation(self.config, chart=chart)
+        simulation.reset(start_time=self.start_time, seed=self.seed)
+        step, tap = simulation.step, simulation.tap
+        current_time = self.start_time
+
+        for kind, a, b in self.iter_events():
+            if kind == TICK_AT:
+                current_time += a
+                step(current_time)
+            elif kind == TICK_EXACT:
+                current_time = a
+                step(current_time)
+            elif kind == FRAMES:
+                for _ in range(a):
+                    step()
+                current_time = simulation.time
+            elif kind == TAP or kind == TAP_EXACT:
+                tap(a, b)
+            else:
+                simulation.spawn_row()
+
+        return simulation
@@ -1,21 +1,27 @@
 
 import random
-from typing import List
-from .entities import Tile, TileColor
+from typing import List, Optional
+from .entities import Tile, BLACK, WHITE
 
 class TileGeneratorService:
 
-    def __init__(self, tile_width: int, tile_height: int):
+    def __init__(self, tile_width: int, tile_height: int, rng: Optional[random.Random] = None,
+                 columns: int = 4):
         self.tile_width = tile_width
         self.tile_height = tile_height
+        self.columns = columns
+        self.rng = rng or random.Random()
+
+    def pick_black_column(self) -> int:
+        return self.rng.randint(0, self.columns - 1)
 
     def generate_row(self, y_position: int = 0) -> List[Tile]:
 
-        black_column = random.randint(0, 3)
+        black_column = self.pick_black_column()
         tiles = []
 
-        for i in range(4):
-            color = TileColor.BLACK if i == black_column else TileColor.WHITE
+        for i in range(self.columns):
+            color = BLACK if i == black_column else WHITE
             tile = Tile(
                 x=i * self.tile_width,
                 y=y_position,
@@ -0,0 +1,159 @@
+import random
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional, Tuple
+from .entities import Board, Score
+from .services import TileGeneratorService
+from .tile_store import TileRowBuffer
+from .chart import Chart
+
+
+@dataclass
+class SimulationConfig:
+    board_width: int = 400
+    board_height: int = 600
+    columns: int = 4
+    tile_height: int = 150
+    base_speed: float = 4.0
+    base_spawn_interval: int = 800
+    speed_increment: float = 0.5
+    frame_ms: float = 1000 / 60
+
+    @property
+    def tile_width(self) -> int:
+        return self.board_width // self.columns
+
+
+class TapResult(Enum):
+    MISS = "miss"
+    HIT = "hit"
+    WRONG = "wrong"
+
+
+class GameSimulation:
+    """
+    Headless Piano Tiles rules: spawn, move, cull and game over on plain numbers.
+
+    Time is in milliseconds and speed in pixels per frame, the same units
+    used by UpdateGameUseCase, so a simulated game follows the real one.
+
+    Each session draws its tiles from its own generator seeded in reset(),
+    and the seeds come from the injected rng, so a session is reproducible
+    from its seed and inputs alone. With a chart, columns, spawn timing and
+    speed changes are streamed from it instead (looping at the end).
+    """
+
+    def __init__(self, config: Optional[SimulationConfig] = None, rng: Optional[random.Random] = None,
+                 chart: Optional[Chart] = None):
+        self.config = config or SimulationConfig()
+        self.rng = rng or random.Random()
+        self.chart = chart
+        self.session_rng = random.Random()
+        self.recorder = None
+        self.board = Board(width=self.config.board_width,
+                           height=self.config.board_height,
+                           columns=self.config.columns)
+        self.tile_generator = TileGeneratorService(tile_width=self.config.tile_width,
+                                                   tile_height=self.config.tile_height,
+                                                   rng=self.session_rng,
+                                                   columns=self.config.columns)
+        self.tiles = TileRowBuffer(tile_width=self.config.tile_width,
+                                   tile_height=self.config.tile_height,
+                                   columns=self.config.columns)
+        self.score = Score()
+        self.reset()
+
+    def reset(self, start_time: float = 0, seed: Optional[int] = None):
+        self.seed = self.rng.getrandbits(64) if seed is None else seed
+        self.session_rng.seed(self.seed)
+        self.recorder = None
+        self.tiles.clear()
+        self.score.reset()
+        self.speed = self.config.base_speed
+        self.time = start_time
+        self.last_spawn_time = start_time
+        self.frames = 0
+        self.game_over = False
+        self.next_interval = self.config.base_spawn_interval
+        self._chart_rows = self.chart.iter_rows() if self.chart else None
+
+    def spawn_interval(self) -> float:
+        return self.next_interval * (self.config.base_speed / self.speed)
+
+    def step(self, current_time: Optional[float] = None) -> bool:
+        """
+        Advance one frame and return True if the game is over.
+        """
+        if self.game_over:
+            return True
+
+        self.time = self.time + self.config.frame_ms if current_time is None else current_time
+        self.frames += 1
+        if self.recorder is not None:
+            self.recorder.record_step(current_time, self.time)
+
+        if self.tiles.update(self.speed, self.board.height):
+            self.game_over = True
+
+        if self.time - self.last_spawn_time > self.spawn_interval():
+            self.last_spawn_time = self.time
+            if not self._spawn_row():
+                self.speed += self.config.speed_increment
+
+        return self.game_over
+
+    def spawn_row(self):
+        """
+        Spawn an extra row outside the timed schedule, e.g. when a game starts.
+        """
+        if self.recorder is not None:
+            self.recorder.record_spawn()
+        self._spawn_row()
+
+    def _spawn_row(self) -> bool:
+        """
+        Push the next row and return True if it set the speed itself.
+        """
+        if self._chart_rows is None:
+            self.tiles.push(self.tile_generator.pick_black_column(), -self.config.tile_height)
+            return False
+
+        row = next(self._chart_rows, None)
+        if row is None:
+            self._chart_rows = self.chart.iter_rows()
+            row = next(self._chart_rows)
+
+        column, _note, interval, speed = row
+        self.tiles.push(column, -self.config.tile_height)
+        self.next_interval = interval
+        if speed:
+            self.speed = speed / 100
+        return bool(speed)
+
+    def tap(self, x: float, y: float) -> Tuple[TapResult, int]:
+        """
+        Apply a click at board coordinates and return the result with the
+        clicked column.
+        """
+        if self.recorder is not None:
+            self.recorder.record_tap(x, y)
+
+        hit = self.tiles.hit_test(x, y)
+        if self.game_over or hit is None or hit.clicked:
+            return TapResult.MISS, -1
+
+        if hit.is_black:
+            self.tiles.mark_clicked(hit.row)
+            self.score.increment()
+            return TapResult.HIT, hit.column
+
+        self.game_over = True
+        return TapResult.WRONG, hit.column
+
+    def run(self, max_frames: int = 100000) -> int:
+        """
+        Step without input until game over and return the frame count.
+        """
+        while not self.step() and self.frames < max_frames:
+            pass
+        return self.frames
@@ -0,0 +1,251 @@
+import numpy as np
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class TileHit(NamedTuple):
+    row: int
+    column: int
+    is_black: bool
+    clicked: bool
+
+
+class TileRowBuffer:
+    """
+    Fixed-capacity ring buffer of tile rows.
+
+    Each row is one entry (y, black column, clicked); the white tiles of a
+    row are implied. Rows are addressed by a monotonically increasing
+    sequence number, spawned at the head and retired from the tail in O(1),
+    and all row positions move with a single array operation.
+    """
+
+    def __init__(self, tile_width: int, tile_height: int, columns: int = 4, capacity: int = 32):
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.columns = columns
+        self._allocate(capacity)
+
+        # Spatial index over y - scroll, which never changes for a row: one
+        # bucket per tile_height band, keeping [oldest, newest] row whose top
+        # falls inside it. Buckets change only on push and retire, never as
+        # rows move.
+        self._buckets: Dict[int, List[int]] = {}
+        self.generation = 0
+        self.clear()
+
+    def _allocate(self, capacity: int):
+        size = 1
+        while size < capacity:
+            size *= 2
+        self.capacity = size
+        self.mask = size - 1
+        self.y = np.zeros(size, dtype=np.float64)
+        self.prev_y = np.zeros(size, dtype=np.float64)
+        self.black_column = np.zeros(size, dtype=np.int8)
+        self.clicked = np.zeros(size, dtype=bool)
+        self.bucket = np.zeros(size, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self.head - self.tail
+
+    def clear(self):
+        self.head = 0
+        self.tail = 0
+        self.pending = 0
+        # All rows move together, so a row's y minus scroll never changes.
+        # Renderers use it to draw rows once, and generation/clicks to notice
+        # a cleared buffer or a newly clicked row.
+        self.scroll = 0.0
+        self.prev_scroll = 0.0
+        self.generation += 1
+        self.clicks = 0
+        self._buckets.clear()
+
+    def push(self, black_column: int, y: float) -> int:
+        """
+        Spawn a row at the head and return its sequence number.
+        """
+        if self.head - self.tail == self.capacity:
+            self._grow()
+
+        slot = self.head & self.mask
+        self.y[slot] = y
+        self.prev_y[slot] = y
+        self.black_column[slot] = black_column
+        self.clicked[slot] = False
+
+        seq = self.head
+        bucket = int((y - self.scroll) // self.tile_height)
+        self.bucket[slot] = bucket
+        entry = self._buckets.get(bucket)
+        if entry is None:
+            self._buckets[bucket] = [seq, seq]
+        else:
+            entry[1] = seq
+        self.head += 1
+        return seq
+
+    def _grow(self):
+        live = list(range(self.tail, self.head))
+        rows = [(self.y[s & self.mask], self.black_column[s & self.mask], self.clicked[s & self.mask],
+                 self.bucket[s & self.mask])
+                for s in live]
+        self._allocate(self.capacity * 2)
+        for seq, (y, column, clicked, bucket) in zip(live, rows):
+            slot = seq & self.mask
+            self.y[slot] = y
+            self.prev_y[slot] = y
+            self.black_column[slot] = column
+            self.clicked[slot] = clicked
+            self.bucket[slot] = bucket
+
+    def update(self, dy: float, bottom: float) -> bool:
+        """
+        Move every row by dy, retire rows whose top passed bottom and
+        return True if an unclicked black tile reached bottom.
+        """
+        y = self.y
+        np.copyto(self.prev_y, y)
+        y += dy
+        self.prev_scroll = self.scroll
+        self.scroll += dy
+
+        mask = self.mask
+        while self.tail < self.head and y[self.tail & mask] >= bottom:
+            self._retire_from_index(self.tail)
+            self.tail += 1
+
+        if self.pending < self.tail:
+            self.pending = self.tail
+        while self.pending < self.head and self.clicked[self.pending & mask]:
+            self.pending += 1
+
+        return (self.pending < self.head and
+                y[self.pending & mask] + self.tile_height >= bottom)
+
+    def _retire_from_index(self, seq: int):
+        bucket = int(self.bucket[seq & self.mask])
+        entry = self._buckets[bucket]
+        if entry[1] == seq:
+            del self._buckets[bucket]
+        else:
+            entry[0] = seq + 1
+
+    def row_at(self, y: float) -> int:
+        """
+        Return the sequence number of the oldest row under y, or -1.
+        """
+        bucket = int((y - self.scroll) // self.tile_height)
+        # A row under y has its top in this band or the one above; one more
+        # band absorbs the rounding between y - scroll now and at push time.
+        # Tops never increase with the sequence number, so those rows form
+        # one contiguous, short range.
+        first = last = -1
+        for b in (bucket - 2, bucket - 1, bucket):
+            entry = self._buckets.get(b)
+            if entry is not None:
+                first = entry[0] if first < 0 else min(first, entry[0])
+                last = max(last, entry[1])
+
+        if first >= 0:
+            for seq in range(max(first, self.tail), last + 1):
+                top = self.y[seq & self.mask]
+                if top <= y < top + self.tile_height:
+                    return seq
+        return -1
+
+    def hit_test(self, x: float, y: float) -> Optional[TileHit]:
+        """
+        Return the tile under (x, y), or None for a miss.
+        """
+        column = int(x // self.tile_width)
+        if not 0 <= column < self.columns:
+            return None
+
+        row = self.row_at(y)
+        if row < 0:
+            return None
+
+        slot = row & self.mask
+        is_black = column == self.black_column[slot]
+        return TileHit(row, column, bool(is_black), bool(is_black and self.clicked[slot]))
+
+    def mark_clicked(self, seq: int):
+        self.clicked[seq & self.mask] = True
+        self.clicks += 1
+
+    def scroll_at(self, alpha: float = 1.0) -> float:
+        return self.prev_scroll + (self.scroll - self.prev_scroll) * alpha
+
+    def iter_sequenced_rows(self, first: int = 0) -> Iterator[Tuple[int, float, int, bool]]:
+        """
+        Yield (seq, y - scroll, black column, clicked) for live rows from first on.
+        """
+        for seq in range(max(first, self.tail), self.head):
+            slot = seq & self.mask
+            yield (seq, float(self.y[slot]) - self.scroll,
+                   int(self.black_column[slot]), bool(self.clicked[slot]))
+
+    def snapshot(self) -> 'TileRowSnapshot':
+        return TileRowSnapshot(self)
+
+    def iter_rows(self, alpha: float = 1.0) -> Iterator[Tuple[int, int, bool]]:
+        """
+        Yield (y, black column, clicked) for every live row, oldest first.
+
+        alpha interpolates y between the previous and the current update,
+        so rendering can fall between two fixed simulation steps.
+        """
+        for seq in range(self.tail, self.head):
+            slot = seq & self.mask
+            y = self.y[slot]
+            if alpha != 1.0:
+                y = self.prev_y[slot] + (y - self.prev_y[slot]) * alpha
+            yield int(y), int(self.black_column[slot]), bool(self.clicked[slot])
+
+
+class TileRowSnapshot:
+    """
+    Immutable copy of the live rows of a TileRowBuffer, with the same read
+    API used for rendering, so another thread can draw it while the buffer
+    keeps changing.
+    """
+
+    __slots__ = ('tile_width', 'tile_height', 'columns', 'tail', 'head', 'scroll', 'prev_scroll',
+                 'generation', 'clicks', 'y', 'prev_y', 'black_column', 'clicked')
+
+    def __init__(self, buffer: TileRowBuffer):
+        self.tile_width = buffer.tile_width
+        self.tile_height = buffer.tile_height
+        self.columns = buffer.columns
+        self.tail = buffer.tail
+        self.head = buffer.head
+        self.scroll = buffer.scroll
+        self.prev_scroll = buffer.prev_scroll
+        self.generation = buffer.generation
+        self.clicks = buffer.clicks
+
+        # Fancy indexing copies, oldest row first.
+        slots = np.arange(buffer.tail, buffer.head) & buffer.mask
+        self.y = buffer.y[slots]
+        self.prev_y = buffer.prev_y[slots]
+        self.black_column = buffer.black_column[slots]
+        self.clicked = buffer.clicked[slots]
+        for array in (self.y, self.prev_y, self.black_column, self.clicked):
+            array.flags.writeable = False
+
+    def __len__(self) -> int:
+        return self.head - self.tail
+
+    def scroll_at(self, alpha: float = 1.0) -> float:
+        return self.prev_scroll + (self.scroll - self.prev_scroll) * alpha
+
+    def iter_sequenced_rows(self, first: int = 0) -> Iterator[Tuple[int, float, int, bool]]:
+        for seq in range(max(first, self.tail), self.head):
+            i = seq - self.tail
+            yield seq, float(self.y[i]) - self.scroll, int(self.black_column[i]), bool(self.clicked[i])
+
+    def iter_rows(self, alpha: float = 1.0) -> Iterator[Tuple[int, int, bool]]:
+        y = self.y if alpha == 1.0 else self.prev_y + (self.y - self.prev_y) * alpha
+        for i in range(len(y)):
+            yield int(y[i]), int(self.black_column[i]), bool(self.clicked[i])
@@ -12,6 +12,9 @@ from .leaderboard_adapter import LeaderboardAdapter
 from .leaderboard_local import LocalLeaderboard
 from .pygame_audio import PygameAudio, PianoNoteGenerator, PRESET_SEQUENCES
 from .system_clock import SystemClock
+from .audio_scheduler import AudioScheduler
+from .sound_bank import SoundBank
+from .waveform_cache import WaveformCache
 
 __all__ = [
     # Adapters (implement domain ports)
@@ -24,6 +27,9 @@ __all__ = [
     'PygameAudio',
     'PianoNoteGenerator',
     'SystemClock',
+    'SoundBank',
+    'AudioScheduler',
+    'WaveformCache',
     
     # Constants
     'PRESET_SEQUENCES',
@@ -0,0 +1,85 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class AudioScheduler:
+    """
+    Plays sounds after a delay without ever sleeping on the caller's thread.
+
+    schedule() queues anything with a play() method and returns a handle
+    for cancel(). Due sounds are played by a timer thread (threaded=True,
+    started on first use) or by calling tick() from the game loop.
+    """
+
+    def __init__(self, threaded: bool = True, clock: Callable[[], float] = time.perf_counter):
+        self.threaded = threaded
+        self.clock = clock
+        # (due time, handle) min-heap; cancelled handles are dropped lazily
+        # when they reach the top.
+        self._queue: List[Tuple[float, int]] = []
+        self._pending: Dict[int, object] = {}
+        self._handles = itertools.count(1)
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, sound, delay_ms: float) -> int:
+        with self._condition:
+            handle = next(self._handles)
+            heapq.heappush(self._queue, (self.clock() + delay_ms / 1000, handle))
+            self._pending[handle] = sound
+            if self.threaded and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audio-scheduler", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return handle
+
+    def cancel(self, handle: int) -> bool:
+        """
+        Drop a scheduled sound; False if it already played or was cancelled.
+        """
+        with self._condition:
+            return self._pending.pop(handle, None) is not None
+
+    def cancel_all(self):
+        with self._condition:
+            self._pending.clear()
+            self._queue.clear()
+
+    def tick(self, now: Optional[float] = None) -> int:
+        """
+        Play every sound that is due and return how many were played.
+        """
+        sounds = self._pop_due(self.clock() if now is None else now)
+        for sound in sounds:
+            sound.play()
+        return len(sounds)
+
+    def _pop_due(self, now: float) -> list:
+        due = []
+        with self._condition:
+            while self._queue and self._queue[0][0] <= now:
+                _, handle = heapq.heappop(self._queue)
+                sound = self._pending.pop(handle, None)
+                if sound is not None:
+                    due.append(sound)
+        return due
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._queue and self._queue[0][1] not in self._pending:
+                    heapq.heappop(self._queue)
+                if not self._queue:
+                    self._condition.wait()
+                    continue
+                delay = self._queue[0][0] - self.clock()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+            self.tick()
+
+    def __len__(self) -> int:
+        return len(self._pending)
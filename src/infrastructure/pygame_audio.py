@@ -1,69 +1,158 @@
 
 import pygame
 import numpy as np
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional, Sequence
 import os
+from .audio_scheduler import AudioScheduler
+from .sound_bank import SoundBank
+from .waveform_cache import WaveformCache
 
 class PianoNoteGenerator:
 
-    def __init__(self, sample_rate: int = 22050):
-        self.sample_rate = sample_rate
-
-    def generate_piano_note(self, frequency: float, duration: float = 0.5) -> pygame.mixer.Sound:
+    # Relative amplitude of the fundamental and its first overtones.
+    HARMONICS = (1.0, 0.5, 0.25, 0.125)
+    # Attack, decay and release as fractions of the note; sustain level.
+    ADSR = (0.05, 0.1, 0.3, 0.7)
+    # Samples per block when splitting the phase for batched synthesis.
+    PHASE_BLOCK = 64
 
+    def __init__(self, sample_rate: int = 22050, cache: Optional[WaveformCache] = None):
+        self.sample_rate = sample_rate
+        self.cache = cache
+        # ADSR envelopes by note length, shared by every note of that length.
+        self._envelopes: Dict[int, np.ndarray] = {}
+
+    def cache_key(self, frequency: float, duration: float) -> str:
+        return WaveformCache.key(kind='piano_note', frequency=frequency, duration=duration,
+                                 sample_rate=self.sample_rate, harmonics=self.HARMONICS,
+                                 adsr=self.ADSR, format='int16_stereo', precision='float32')
+
+    def synthesize_bank(self, frequencies: Sequence[float], duration: float = 0.5) -> np.ndarray:
+        """
+        Return every frequency as one row of an (n_notes, n_samples) int16
+        mono bank, computed in a single broadcasted float32 pass.
+        """
         n_samples = int(self.sample_rate * duration)
 
-        t = np.linspace(0, duration, n_samples, False)
-
-        wave = np.zeros_like(t)
-
-        wave += np.sin(2 * np.pi * frequency * t)
-
-        wave += 0.5 * np.sin(2 * np.pi * frequency * 2 * t)
-
-        wave += 0.25 * np.sin(2 * np.pi * frequency * 3 * t)
-
-        wave += 0.125 * np.sin(2 * np.pi * frequency * 4 * t)
+        count = len(frequencies)
+        frequencies = np.asarray(frequencies, dtype=np.float64)[:, None]
+        step = duration / n_samples
+        block = self.PHASE_BLOCK
+        blocks = -(-n_samples // block)
+
+        # Phase in cycles as block start + offset within the block. Only the
+        # block starts need reducing mod 1 (in float64, on a small grid), so
+        # the float32 sum stays accurate however long the note is.
+        starts = (frequencies * (np.arange(blocks) * (block * step))) % 1.0
+        offsets = frequencies * (np.arange(block) * step)
+        theta = starts.astype(np.float32)[:, :, None] + offsets.astype(np.float32)[:, None, :]
+        theta = theta.reshape(count, blocks * block)[:, :n_samples]
+        theta *= np.float32(2 * np.pi)
+
+        # sin(k*theta) for the overtones comes from the recurrence
+        # sin((k+1)x) = 2cos(x)sin(kx) - sin((k-1)x), so only one sin and
+        # one cos are evaluated per sample.
+        sine = np.sin(theta)
+        two_cos = np.cos(theta, out=theta)
+        two_cos *= 2
+
+        wave = sine * np.float32(self.HARMONICS[0])
+        previous = np.zeros_like(sine)
+        current = sine
+        scratch = np.empty_like(sine)
+        for amplitude in self.HARMONICS[1:]:
+            np.multiply(two_cos, current, out=scratch)
+            np.subtract(scratch, previous, out=previous)
+            previous, current = current, previous
+            wave += np.multiply(current, np.float32(amplitude), out=scratch)
+
+        wave /= np.max(np.abs(wave), axis=1, keepdims=True)
+        wave *= self._envelope(n_samples, duration)
+        wave *= 32767
+
+        return wave.astype(np.int16)
+
+    def synthesize(self, frequency: float, duration: float = 0.5) -> np.ndarray:
+        """
+        Return the note as an (n_samples, 2) int16 stereo array.
+        """
+        return self._stereo(self.synthesize_bank((frequency,), duration)[0])
+
+    def waveforms(self, frequencies: Sequence[float], duration: float = 0.5,
+                  on_synthesize: Optional[Callable[[List[int]], None]] = None) -> List[np.ndarray]:
+        """
+        Stereo waveforms for frequencies; cache misses are synthesized
+        together in one bank, after passing their indices to on_synthesize.
+        """
+        def synthesize(missing: List[int]) -> List[np.ndarray]:
+            if on_synthesize is not None:
+                on_synthesize(missing)
+            return [self._stereo(row)
+                    for row in self.synthesize_bank([frequencies[i] for i in missing], duration)]
+
+        if self.cache is None:
+            return synthesize(list(range(len(frequencies))))
+
+        keys = [self.cache_key(frequency, duration) for frequency in frequencies]
+        return self.cache.get_many(keys, synthesize)
+
+    def waveform(self, frequency: float, duration: float = 0.5) -> np.ndarray:
+        return self.waveforms((frequency,), duration)[0]
+
+    def generate_piano_notes(self, frequencies: Sequence[float], duration: float = 0.5,
+                             on_synthesize: Optional[Callable[[List[int]], None]] = None
+                             ) -> List[pygame.mixer.Sound]:
+        return [pygame.mixer.Sound(buffer=waveform)
+                for waveform in self.waveforms(frequencies, duration, on_synthesize)]
 
-        wave = wave / np.max(np.abs(wave))
-
-        envelope = self._create_adsr_envelope(n_samples, duration)
-        wave = wave * envelope
-
-        wave = np.int16(wave * 32767)
-
-        stereo_wave = np.column_stack((wave, wave))
+    def generate_piano_note(self, frequency: float, duration: float = 0.5) -> pygame.mixer.Sound:
+        return self.generate_piano_notes((frequency,), duration)[0]
 
-        sound = pygame.mixer.Sound(buffer=stereo_wave)
+    @staticmethod
+    def _stereo(row: np.ndarray) -> np.ndarray:
+        return np.repeat(row[:, None], 2, axis=1)
 
-        return sound
+    def _envelope(self, n_samples: int, duration: float) -> np.ndarray:
+        envelope = self._envelopes.get(n_samples)
+        if envelope is None:
+            envelope = self._create_adsr_envelope(n_samples, duration).astype(np.float32)
+            self._envelopes[n_samples] = envelope
+        return envelope
 
     def _create_adsr_envelope(self, n_samples: int, duration: float) -> np.ndarray:
         envelope = np.ones(n_samples)
 
-        attack_samples = int(n_samples * 0.05)
-        decay_samples = int(n_samples * 0.1)
-        release_samples = int(n_samples * 0.3)
+        attack, decay, release, sustain = self.ADSR
+        attack_samples = int(n_samples * attack)
+        decay_samples = int(n_samples * decay)
+        release_samples = int(n_samples * release)
 
         if attack_samples > 0:
             envelope[:attack_samples] = np.linspace(0, 1, attack_samples)
 
         if decay_samples > 0:
             decay_end = attack_samples + decay_samples
-            envelope[attack_samples:decay_end] = np.linspace(1, 0.7, decay_samples)
+            envelope[attack_samples:decay_end] = np.linspace(1, sustain, decay_samples)
 
         sustain_start = attack_samples + decay_samples
         sustain_end = n_samples - release_samples
-        envelope[sustain_start:sustain_end] = 0.7
+        envelope[sustain_start:sustain_end] = sustain
 
         if release_samples > 0:
-            envelope[-release_samples:] = np.linspace(0.7, 0, release_samples)
+            envelope[-release_samples:] = np.linspace(sustain, 0, release_samples)
 
         return envelope
 
 class PygameAudio:
 
     NOTES = {
+        'C3': 130.81,
+        'D3': 146.83,
+        'E3': 164.81,
+        'F3': 174.61,
+        'G3': 196.00,
+        'A3': 220.00,
+        'B3': 246.94,
         'C4': 261.63,
         'D4': 293.66,
         'E4': 329.63,
@@ -72,9 +161,16 @@ class PygameAudio:
         'A4': 440.00,
         'B4': 493.88,
         'C5': 523.25,
+        'D5': 587.33,
+        'E5': 659.25,
+        'F5': 698.46,
+        'G5': 783.99,
+        'A5': 880.00,
+        'B5': 987.77,
     }
 
-    def __init__(self, note_sequence: Optional[list] = None):
+    def __init__(self, note_sequence: Optional[list] = None, cache: Optional[WaveformCache] = None,
+                 sound_bank: Optional[SoundBank] = None):
 
         pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
 
@@ -84,7 +180,15 @@ class PygameAudio:
 
         self.note_sequence = note_sequence
 
-        self.note_generator = PianoNoteGenerator()
+        # Waveforms are cached on disk, so later starts map them instead of
+        # synthesizing them again.
+        self.note_generator = PianoNoteGenerator(cache=WaveformCache() if cache is None else cache)
+        # Column sounds come from a bank shared by all note sequences, so a
+        # sequence change only creates the notes not already loaded.
+        self.sound_bank = SoundBank() if sound_bank is None else sound_bank
+        self.volume = 1.0
+        # Delayed sounds are played from a timer thread, never by sleeping.
+        self.scheduler = AudioScheduler()
 
         self.column_sounds: Dict[int, pygame.mixer.Sound] = {}
 
@@ -97,16 +201,28 @@ class PygameAudio:
 
 
     def _generate_column_sounds(self):
-        for column in range(4):
-            note_name = self.note_sequence[column]
-            frequency = self.NOTES[note_name]
+        sounds = self.sound_bank.get_many(self.note_sequence[:4], 0.4, self._create_notes)
+        for column, sound in enumerate(sounds):
+            # Banked sounds are shared, so their volume is set on every use.
+            sound.set_volume(self.volume * 0.6)
+            self.column_sounds[column] = sound
 
-            print(f"   Generando nota {note_name} ({frequency:.2f} Hz) para columna {column}")
+    def _create_notes(self, note_names: List[str]) -> List[pygame.mixer.Sound]:
+        frequencies = [self.NOTES[note_name] for note_name in note_names]
 
-            sound = self.note_generator.generate_piano_note(frequency, duration=0.4)
-            sound.set_volume(0.6)
+        def report(missing: List[int]):
+            for i in missing:
+                print(f"   Generando nota {note_names[i]} ({frequencies[i]:.2f} Hz)")
 
-            self.column_sounds[column] = sound
+        return self.note_generator.generate_piano_notes(frequencies, duration=0.4, on_synthesize=report)
+
+    def prewarm(self, note_names: Optional[Sequence[str]] = None):
+        """
+        Load every note of the instrument (NOTES by default) into the sound
+        bank in one batch, so later sequence changes are pure bank hits.
+        """
+        note_names = list(self.NOTES) if note_names is None else list(note_names)
+        self.sound_bank.get_many(note_names, 0.4, self._create_notes)
 
     def _generate_special_sounds(self):
         error_freq = 110.0
@@ -137,15 +253,18 @@ class PygameAudio:
     def play_game_over_sound(self):
         if self.game_over_sound:
 
+            # A short gap after cutting the other sounds, without blocking
+            # the game loop.
             self.stop_all_sounds()
-            pygame.time.wait(100)
-            self.game_over_sound.play()
+            self.scheduler.schedule(self.game_over_sound, 100)
 
     def stop_all_sounds(self):
+        self.scheduler.cancel_all()
         pygame.mixer.stop()
 
     def set_volume(self, volume: float):
         volume = max(0.0, min(1.0, volume))
+        self.volume = volume
 
         for sound in self.column_sounds.values():
             sound.set_volume(volume * 0.6)
@@ -1,3 +1,6 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from typing import Optional
 from ..domain.ports import AudioPort
 from .pygame_audio import PygameAudio
@@ -6,35 +9,90 @@ from .pygame_audio import PygameAudio
 class PygameAudioAdapter(AudioPort):
     """
     Adapter that implements AudioPort interface using PygameAudio implementation.
+
+    With background=True, PygameAudio (mixer init and note synthesis) is
+    built on a worker thread and `ready` is its Future. Until it is done,
+    playback calls do nothing, and volume or note sequence changes are kept
+    and applied when the sounds are swapped in.
     """
     
-    def __init__(self, note_sequence: Optional[list] = None):
-        self._pygame_audio = PygameAudio(note_sequence)
+    def __init__(self, note_sequence: Optional[list] = None, background: bool = False):
+        self._pygame_audio: Optional[PygameAudio] = None
+        self._lock = threading.Lock()
+        self._volume: Optional[float] = None
+        self._note_sequence: Optional[list] = None
+        self.ready_time: Optional[float] = None
+
+        if background:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-init")
+            self.ready: Future = executor.submit(self._load, note_sequence)
+            executor.shutdown(wait=False)
+        else:
+            self.ready = Future()
+            self.ready.set_result(self._load(note_sequence))
+
+    @property
+    def is_ready(self) -> bool:
+        return self._pygame_audio is not None
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until loading has finished (or failed); True if audio is usable."""
+        wait([self.ready], timeout=timeout)
+        return self.is_ready
+
+    def _load(self, note_sequence: Optional[list]) -> PygameAudio:
+        audio = PygameAudio(note_sequence)
+        with self._lock:
+            if self._note_sequence is not None:
+                audio.change_note_sequence(self._note_sequence)
+            if self._volume is not None:
+                audio.set_volume(self._volume)
+            self._pygame_audio = audio
+            self.ready_time = time.perf_counter()
+        return audio
     
     def play_click_sound(self):
         """Play a click sound when a tile is clicked."""
-        self._pygame_audio.play_click_sound()
+        audio = self._pygame_audio
+        if audio is not None:
+            audio.play_click_sound()
     
     def play_error_sound(self):
         """Play an error sound when a wrong tile is clicked."""
-        self._pygame_audio.play_error_sound()
+        audio = self._pygame_audio
+        if audio is not None:
+            audio.play_error_sound()
     
     def play_game_over_sound(self):
         """Play a game over sound when the game ends."""
-        self._pygame_audio.play_game_over_sound()
+        audio = self._pygame_audio
+        if audio is not None:
+            audio.play_game_over_sound()
     
     def stop_all_sounds(self):
         """Stop all currently playing sounds."""
-        self._pygame_audio.stop_all_sounds()
+        audio = self._pygame_audio
+        if audio is not None:
+            audio.stop_all_sounds()
     
     def play_note_for_column(self, column: int):
         """Play a specific note for a column (additional method for enhanced audio)."""
-        self._pygame_audio.play_note_for_column(column)
+        audio = self._pygame_audio
+        if audio is not None:
+            audio.play_note_for_column(column)
     
     def set_volume(self, volume: float):
         """Set the volume for all sounds."""
+        with self._lock:
+            if self._pygame_audio is None:
+                self._volume = volume
+                return
         self._pygame_audio.set_volume(volume)
     
     def change_note_sequence(self, note_sequence: list):
         """Change the note sequence for the columns."""
+        with self._lock:
+            if self._pygame_audio is None:
+                self._note_sequence = note_sequence
+                return
         self._pygame_audio.change_note_sequence(note_sequence)
@@ -0,0 +1,82 @@
+import os
+import pygame
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional, Sequence, Tuple
+
+
+class SoundBank:
+    """
+    LRU-bounded bank of mixer sounds keyed by (note, duration), shared by
+    every note sequence, so switching songs reuses the notes they have in
+    common. Bounded by entry count and optionally by bytes of sample data
+    (max_bytes, or PIANO_TILES_SOUND_BANK_MB).
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: Optional[int] = None):
+        if max_bytes is None and os.environ.get("PIANO_TILES_SOUND_BANK_MB"):
+            max_bytes = int(float(os.environ["PIANO_TILES_SOUND_BANK_MB"]) * 1024 * 1024)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sounds: "OrderedDict[tuple, Tuple[pygame.mixer.Sound, int]]" = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def sound_bytes(sound: pygame.mixer.Sound) -> int:
+        frequency, size, channels = pygame.mixer.get_init()
+        return round(sound.get_length() * frequency) * channels * (abs(size) // 8)
+
+    def get(self, note: Hashable, duration: float,
+            create: Callable[[], pygame.mixer.Sound]) -> pygame.mixer.Sound:
+        return self.get_many((note,), duration, lambda missing: [create()])[0]
+
+    def get_many(self, notes: Sequence[Hashable], duration: float,
+                 create: Callable[[List[Hashable]], Sequence[pygame.mixer.Sound]]) -> List[pygame.mixer.Sound]:
+        """
+        Sounds for notes, in order; create receives every missing note once,
+        in a single call, and returns their sounds in that order.
+        """
+        found = {}
+        missing = []
+        for note in notes:
+            key = (note, duration)
+            if note in found or note in missing:
+                continue
+            entry = self._sounds.get(key)
+            if entry is None:
+                missing.append(note)
+            else:
+                self._sounds.move_to_end(key)
+                found[note] = entry[0]
+        self.hits += len(found)
+        self.misses += len(missing)
+
+        if missing:
+            for note, sound in zip(missing, create(missing)):
+                found[note] = sound
+                self._add((note, duration), sound)
+        return [found[note] for note in notes]
+
+    def _add(self, key: tuple, sound: pygame.mixer.Sound):
+        nbytes = self.sound_bytes(sound)
+        self._sounds[key] = (sound, nbytes)
+        self.nbytes += nbytes
+        # The newest sound always stays, even if it alone exceeds max_bytes.
+        while len(self._sounds) > 1 and (
+                len(self._sounds) > self.max_entries
+                or (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+            _, (_, evicted_bytes) = self._sounds.popitem(last=False)
+            self.nbytes -= evicted_bytes
+            self.evictions += 1
+
+    def clear(self):
+        self._sounds.clear()
+        self.nbytes = 0
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._sounds
+
+    def __len__(self) -> int:
+        return len(self._sounds)
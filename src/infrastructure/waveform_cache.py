@@ -0,0 +1,80 @@
+import hashlib
+import os
+import tempfile
+import numpy as np
+from typing import Callable, List, Optional, Sequence
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "piano_tiles", "waveforms")
+
+
+class WaveformCache:
+    """
+    Content-addressed on-disk cache of synthesized waveforms.
+
+    Each waveform is stored as <sha256 of its synthesis key>.npy and read
+    back memory-mapped, so a warm start maps files instead of running the
+    synthesis again. If the directory cannot be written, waveforms are
+    simply synthesized in memory.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.environ.get("PIANO_TILES_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(**params) -> str:
+        text = repr(sorted(params.items()))
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def load(self, key: str) -> Optional[np.ndarray]:
+        try:
+            return np.load(self.path(key), mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+
+    def store(self, key: str, waveform: np.ndarray) -> np.ndarray:
+        """
+        Write waveform atomically and return it memory-mapped from disk,
+        or unchanged if it could not be written.
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    np.save(f, waveform)
+                os.replace(tmp_path, self.path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            return waveform
+        stored = self.load(key)
+        return waveform if stored is None else stored
+
+    def get(self, key: str, synthesize: Callable[[], np.ndarray]) -> np.ndarray:
+        waveform = self.load(key)
+        if waveform is not None:
+            self.hits += 1
+            return waveform
+        self.misses += 1
+        return self.store(key, synthesize())
+
+    def get_many(self, keys: Sequence[str],
+                 synthesize: Callable[[List[int]], Sequence[np.ndarray]]) -> List[np.ndarray]:
+        """
+        Like get() for several keys; synthesize receives the indices of all
+        misses at once and returns their waveforms in that order.
+        """
+        waveforms = [self.load(key) for key in keys]
+        missing = [i for i, waveform in enumerate(waveforms) if waveform is None]
+        self.hits += len(waveforms) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            for i, waveform in zip(missing, synthesize(missing)):
+                waveforms[i] = self.store(keys[i], waveform)
+        return waveforms
@@ -1,8 +1,12 @@
 
 
 import pygame
+from collections import OrderedDict
 from typing import List, Optional
 from dataclasses import dataclass
+from .render_scale import RenderScaler
+from .strip_renderer import ScrollingStripRenderer
+from .text_cache import TextCache
 
 @dataclass
 class Color:
@@ -17,158 +21,352 @@ class Color:
 
 class GameView:
 
-    def __init__(self, width: int = 400, height: int = 600):
-        pygame.init()
-
+    def __init__(self, width: int = 400, height: int = 600, dirty_rects: bool = False,
+                 render_scale: float = 1.0, scaled_window: bool = False,
+                 scaler: Optional[RenderScaler] = None):
+        # Only what the view uses: the mixer is opened by the audio layer,
+        # possibly on a worker thread and with its own settings.
+        pygame.display.init()
+        pygame.font.init()
+
+        # Drawing uses logical coordinates (width x height, as input and the
+        # simulation do). With render_scale below 1 the frame is drawn into a
+        # smaller off-screen surface and scaled up to the window once per
+        # frame; scaled_window lets SDL scale the window itself (SCALED) to
+        # the display. A RenderScaler adjusts render_scale from frame times.
         self.width = width
         self.height = height
-        self.screen = pygame.display.set_mode((width, height))
+        self.scaled_window = scaled_window
+        self.window = pygame.display.set_mode((width, height), pygame.SCALED if scaled_window else 0)
         pygame.display.set_caption("Piano Tiles - Arquitectura en Capas")
-
-        self.font_large = pygame.font.SysFont("arial", 40, bold=True)
-        self.font_medium = pygame.font.SysFont("arial", 30)
-        self.font_small = pygame.font.SysFont("arial", 20)
+        self.scaler = scaler
 
         self.tile_width = width // 4
         self.tile_height = 150
 
         self.colors = Color()
 
+        # Pre-rendered tile variants keyed by (width, height, color, clicked).
+        self._tile_sprites = {}
+        self._strip: Optional[ScrollingStripRenderer] = None
+
+        # Rendered text, solid/translucent backgrounds, and full-screen
+        # overlays flattened into one surface, so HUD and overlays never
+        # re-rasterize text. While an overlay stays up the tiles under it do
+        # not move, so the composed frame is kept and blitted as is.
+        self.text_cache = TextCache()
+        self._filled_surfaces = {}
+        self._overlays = OrderedDict()
+        self._overlay_frame: Optional[pygame.Surface] = None
+        self._overlay_frame_key = None
+        self._font_mono = None
+        self.set_render_scale(render_scale)
+
+        # Dirty-rect mode: the back buffer is still fully redrawn, but only the
+        # regions that changed since the last frame are pushed to the display.
+        # Full-screen overlays push once and then only what is drawn over them
+        # (the profiler panel) while unchanged.
+        self.dirty_rects = dirty_rects
+        self._dirty: List[pygame.Rect] = []
+        self._previous_dirty: List[pygame.Rect] = []
+        self._overlay_key = None
+        self._previous_overlay_key = None
+        self._full_update = True
+
+    def set_render_scale(self, scale: float):
+        self.render_scale = scale
+        if scale == 1.0:
+            self.screen = self.window
+        else:
+            self.screen = pygame.Surface((self._px(self.width), self._px(self.height))).convert()
+
+        self.font_large = pygame.font.SysFont("arial", self._px(40), bold=True)
+        self.font_medium = pygame.font.SysFont("arial", self._px(30))
+        self.font_small = pygame.font.SysFont("arial", self._px(20))
+        self._font_mono = None
+
+        self._tile_sprites.clear()
+        self._strip = None
+        self.text_cache.clear()
+        self._filled_surfaces.clear()
+        self._overlays.clear()
+        self._overlay_frame = None
+        self.invalidate()
+
+    def record_frame_time(self, frame_ms: float):
+        """
+        Feed the time spent drawing and presenting a frame to the scaler.
+        """
+        if self.scaler is not None:
+            scale = self.scaler.record(frame_ms, self.render_scale)
+            if scale is not None:
+                self.set_render_scale(scale)
+
+    def _px(self, value: float) -> int:
+        """Logical length to render-surface pixels, at least one."""
+        if self.render_scale == 1.0:
+            return int(value)
+        return max(1, round(value * self.render_scale))
+
+    def _pos(self, value: float) -> int:
+        """Logical coordinate to render-surface pixels; may be zero or negative."""
+        if self.render_scale == 1.0:
+            return int(value)
+        return round(value * self.render_scale)
+
     def clear_screen(self, color: tuple = None):
         if color is None:
             color = self.colors.WHITE
         self.screen.fill(color)
 
+    def _tile_sprite(self, width: int, height: int, color: tuple, clicked: bool = False) -> pygame.Surface:
+        key = (width, height, color, clicked)
+        sprite = self._tile_sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((self._px(width), self._px(height))).convert()
+            sprite.fill(self.colors.GRAY if clicked else color)
+            pygame.draw.rect(sprite, self.colors.DARK_GRAY, sprite.get_rect(), self._px(2))
+            self._tile_sprites[key] = sprite
+        return sprite
+
     def draw_tile(self, x: int, y: int, width: int, height: int,
                   color: tuple, clicked: bool = False):
-        rect = pygame.Rect(x, y, width, height)
-
-        tile_color = self.colors.GRAY if clicked else color
-        pygame.draw.rect(self.screen, tile_color, rect)
-
-        border_color = self.colors.DARK_GRAY
-        pygame.draw.rect(self.screen, border_color, rect, 2)
+        self.screen.blit(self._tile_sprite(width, height, color, clicked), (self._pos(x), self._pos(y)))
 
     def draw_tiles(self, tiles: List[dict]):
+        batch = []
         for tile in tiles:
             rect = tile['rect']
-            self.draw_tile(
-                rect.x,
-                rect.y,
-                rect.width,
-                rect.height,
-                tile['color'],
-                tile.get('clicked', False)
-            )
+            self._mark_dirty(rect)
+            batch.append((self._tile_sprite(rect.width, rect.height, tile['color'],
+                                            tile.get('clicked', False)), (self._pos(rect.x), self._pos(rect.y))))
+        self.screen.blits(batch, doreturn=False)
+
+    def draw_tile_strip(self, tiles, alpha: float = 1.0):
+        """
+        Draw background, grid lines and tiles with one scrolled blit of a
+        strip the rows are painted into once; replaces clear_screen and
+        draw_grid_lines.
+        """
+        strip = self._strip
+        if (strip is None or strip.tile_width != self._px(tiles.tile_width)
+                or strip.tile_height != self._px(tiles.tile_height) or len(strip.row_sprites) != tiles.columns):
+            tile_width, tile_height = tiles.tile_width, tiles.tile_height
+            strip = self._strip = ScrollingStripRenderer(
+                self.screen.get_width(), self.screen.get_height(),
+                self._px(tile_width), self._px(tile_height), tiles.columns,
+                self._tile_sprite(tile_width, tile_height, self.colors.WHITE),
+                self._tile_sprite(tile_width, tile_height, self.colors.BLACK),
+                self._tile_sprite(tile_width, tile_height, self.colors.BLACK, True),
+                self.colors.DARK_GRAY, scale=self.render_scale, line_width=self._px(2))
+
+        strip.draw(self.screen, tiles, alpha)
+        # Only the rows change between frames; the background and grid
+        # lines around them stay where they are.
+        if self.dirty_rects:
+            for rect in strip.row_rects(tiles):
+                self._mark_dirty(rect)
+
+    def _text(self, font: pygame.font.Font, text: str, color: tuple) -> pygame.Surface:
+        return self.text_cache.render(font, text, color)
+
+    def _filled_surface(self, size: tuple, color: tuple, alpha: Optional[int] = None) -> pygame.Surface:
+        key = (size, color, alpha)
+        surface = self._filled_surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface(size).convert()
+            surface.fill(color)
+            if alpha is not None:
+                surface.set_alpha(alpha)
+            self._filled_surfaces[key] = surface
+        return surface
+
+    def _centered(self, surface: pygame.Surface, dy: int) -> tuple:
+        center = (self.screen.get_width() // 2, self.screen.get_height() // 2 + self._pos(dy))
+        return surface, surface.get_rect(center=center).topleft
+
+    def _draw_overlay(self, key: tuple, color: tuple, alpha: Optional[int], build):
+        """
+        Draw a full-screen overlay of color (translucent if alpha is given)
+        with the texts build() returns as (surface, position) pairs.
+
+        The overlay is flattened into one surface on first use; the frame it
+        composes is reused for as long as the same overlay stays up.
+        """
+        previous_key = self._previous_overlay_key
+        self._mark_overlay(key)
+        if self._overlay_frame is not None and key == self._overlay_frame_key == previous_key:
+            # Whatever was drawn so far is covered by the unchanged frame.
+            self._dirty.clear()
+            self.screen.blit(self._overlay_frame, (0, 0))
+            return
+
+        overlay = self._overlays.get(key)
+        if overlay is None:
+            if alpha is None:
+                overlay = pygame.Surface(self.screen.get_size()).convert()
+                overlay.fill(color)
+            else:
+                # Premultiplied, so the texts blend onto the translucent
+                # background exactly as they would onto the screen. Texts are
+                # converted first: premul_alpha() leaves the transparent
+                # pixels of font surfaces opaque.
+                overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA).convert_alpha()
+                overlay.fill((*(c * alpha // 255 for c in color), alpha))
+            for text, position in build():
+                overlay.blit(text.convert_alpha().premul_alpha(), position,
+                             special_flags=pygame.BLEND_PREMULTIPLIED)
+            self._overlays[key] = overlay
+            if len(self._overlays) > 16:
+                self._overlays.popitem(last=False)
+        else:
+            self._overlays.move_to_end(key)
+        self.screen.blit(overlay, (0, 0), special_flags=0 if alpha is None else pygame.BLEND_PREMULTIPLIED)
+        self._overlay_frame = self.screen.copy()
+        self._overlay_frame_key = key
 
     def draw_score(self, score: int, x: int = 10, y: int = 10):
-        score_text = self.font_medium.render(f"Score: {score}", True, self.colors.BLACK)
+        score_text = self._text(self.font_medium, f"Score: {score}", self.colors.BLACK)
+        x, y, pad = self._pos(x), self._pos(y), self._px(5)
 
-        background = pygame.Surface((score_text.get_width() + 20, score_text.get_height() + 10))
-        background.fill(self.colors.LIGHT_GRAY)
-        background.set_alpha(200)
-        self.screen.blit(background, (x - 5, y - 5))
+        background = self._filled_surface((score_text.get_width() + 4 * pad, score_text.get_height() + 2 * pad),
+                                          self.colors.LIGHT_GRAY, 200)
+        self.screen.blit(background, (x - pad, y - pad))
+        self._mark_dirty(background.get_rect(topleft=(x - pad, y - pad)))
 
         self.screen.blit(score_text, (x, y))
 
     def draw_speed_indicator(self, speed: float, x: int = 10, y: int = 50):
-        speed_text = self.font_small.render(f"Speed: {speed:.1f}x", True, self.colors.BLUE)
-        self.screen.blit(speed_text, (x, y))
+        speed_text = self._text(self.font_small, f"Speed: {speed:.1f}x", self.colors.BLUE)
+        position = (self._pos(x), self._pos(y))
+        self.screen.blit(speed_text, position)
+        self._mark_dirty(speed_text.get_rect(topleft=position))
 
     def draw_game_over_screen(self, score: int, high_score: Optional[int] = None):
-        overlay = pygame.Surface((self.width, self.height))
-        overlay.fill(self.colors.BLACK)
-        overlay.set_alpha(150)
-        self.screen.blit(overlay, (0, 0))
-
-        title = self.font_large.render("GAME OVER", True, self.colors.RED)
-        title_rect = title.get_rect(center=(self.width // 2, self.height // 2 - 80))
-        self.screen.blit(title, title_rect)
-
-        score_text = self.font_medium.render(f"Score: {score}", True, self.colors.WHITE)
-        score_rect = score_text.get_rect(center=(self.width // 2, self.height // 2 - 20))
-        self.screen.blit(score_text, score_rect)
-
-        if high_score is not None:
-            high_score_text = self.font_small.render(
-                f"Best: {high_score}",
-                True,
-                self.colors.GREEN if score >= high_score else self.colors.WHITE
-            )
-            high_score_rect = high_score_text.get_rect(center=(self.width // 2, self.height // 2 + 15))
-            self.screen.blit(high_score_text, high_score_rect)
-
-        restart_text = self.font_small.render("Press R to Restart", True, self.colors.WHITE)
-        restart_rect = restart_text.get_rect(center=(self.width // 2, self.height // 2 + 60))
-        self.screen.blit(restart_text, restart_rect)
-
-        quit_text = self.font_small.render("Press ESC to Quit", True, self.colors.LIGHT_GRAY)
-        quit_rect = quit_text.get_rect(center=(self.width // 2, self.height // 2 + 90))
-        self.screen.blit(quit_text, quit_rect)
+        def build():
+            layers = [
+                self._centered(self._text(self.font_large, "GAME OVER", self.colors.RED), -80),
+                self._centered(self._text(self.font_medium, f"Score: {score}", self.colors.WHITE), -20),
+            ]
+            if high_score is not None:
+                color = self.colors.GREEN if score >= high_score else self.colors.WHITE
+                layers.append(self._centered(self._text(self.font_small, f"Best: {high_score}", color), 15))
+            layers.append(self._centered(self._text(self.font_small, "Press R to Restart", self.colors.WHITE), 60))
+            layers.append(self._centered(self._text(self.font_small, "Press ESC to Quit", self.colors.LIGHT_GRAY), 90))
+            return layers
+
+        self._draw_overlay(('game_over', score, high_score), self.colors.BLACK, 150, build)
 
     def draw_start_screen(self):
-        self.clear_screen(self.colors.BLACK)
-
-        title = self.font_large.render("PIANO TILES", True, self.colors.WHITE)
-        title_rect = title.get_rect(center=(self.width // 2, self.height // 2 - 80))
-        self.screen.blit(title, title_rect)
-
-        subtitle = self.font_small.render("Arquitectura en Capas", True, self.colors.GRAY)
-        subtitle_rect = subtitle.get_rect(center=(self.width // 2, self.height // 2 - 40))
-        self.screen.blit(subtitle, subtitle_rect)
-
-        instructions = [
-            "Click on BLACK tiles only!",
-            "Don't let them reach the bottom",
-            "",
-            "Press SPACE to Start",
-            "Press ESC to Quit"
-        ]
-
-        y_offset = self.height // 2
-        for i, instruction in enumerate(instructions):
-            if instruction == "":
-                y_offset += 15
-                continue
-            text = self.font_small.render(instruction, True, self.colors.WHITE)
-            text_rect = text.get_rect(center=(self.width // 2, y_offset + i * 30))
-            self.screen.blit(text, text_rect)
+        def build():
+            layers = [
+                self._centered(self._text(self.font_large, "PIANO TILES", self.colors.WHITE), -80),
+                self._centered(self._text(self.font_small, "Arquitectura en Capas", self.colors.GRAY), -40),
+            ]
+
+            instructions = [
+                "Click on BLACK tiles only!",
+                "Don't let them reach the bottom",
+                "",
+                "Press SPACE to Start",
+                "Press ESC to Quit"
+            ]
+
+            y_offset = 0
+            for i, instruction in enumerate(instructions):
+                if instruction == "":
+                    y_offset += 15
+                    continue
+                text = self._text(self.font_small, instruction, self.colors.WHITE)
+                layers.append(self._centered(text, y_offset + i * 30))
+            return layers
+
+        self._draw_overlay(('start',), self.colors.BLACK, None, build)
 
     def draw_pause_screen(self, score: int):
-        overlay = pygame.Surface((self.width, self.height))
-        overlay.fill(self.colors.BLACK)
-        overlay.set_alpha(180)
-        self.screen.blit(overlay, (0, 0))
-
-        title = self.font_large.render("PAUSED", True, self.colors.BLUE)
-        title_rect = title.get_rect(center=(self.width // 2, self.height // 2 - 60))
-        self.screen.blit(title, title_rect)
-
-        score_text = self.font_medium.render(f"Score: {score}", True, self.colors.WHITE)
-        score_rect = score_text.get_rect(center=(self.width // 2, self.height // 2))
-        self.screen.blit(score_text, score_rect)
-
-        resume_text = self.font_small.render("Press P to Resume", True, self.colors.WHITE)
-        resume_rect = resume_text.get_rect(center=(self.width // 2, self.height // 2 + 50))
-        self.screen.blit(resume_text, resume_rect)
-
-        quit_text = self.font_small.render("Press ESC to Quit", True, self.colors.LIGHT_GRAY)
-        quit_rect = quit_text.get_rect(center=(self.width // 2, self.height // 2 + 80))
-        self.screen.blit(quit_text, quit_rect)
+        def build():
+            return [
+                self._centered(self._text(self.font_large, "PAUSED", self.colors.BLUE), -60),
+                self._centered(self._text(self.font_medium, f"Score: {score}", self.colors.WHITE), 0),
+                self._centered(self._text(self.font_small, "Press P to Resume", self.colors.WHITE), 50),
+                self._centered(self._text(self.font_small, "Press ESC to Quit", self.colors.LIGHT_GRAY), 80),
+            ]
+
+        self._draw_overlay(('pause', score), self.colors.BLACK, 180, build)
+
+    def draw_profiler(self, lines: List[str], x: int = 10):
+        if self._font_mono is None:
+            self._font_mono = pygame.font.SysFont("monospace", self._px(14))
+        line_height = self._font_mono.get_linesize()
+        pad = self._px(5)
+        width = max(self._font_mono.size(line)[0] for line in lines) + 2 * pad
+        height = len(lines) * line_height + 2 * pad
+        rect = pygame.Rect(self._pos(x), self.screen.get_height() - height - pad, width, height)
+
+        self.screen.blit(self._filled_surface(rect.size, self.colors.BLACK, 190), rect.topleft)
+        self.screen.blits([(self._text(self._font_mono, line, self.colors.GREEN),
+                            (rect.x + pad, rect.y + pad + i * line_height))
+                           for i, line in enumerate(lines)], doreturn=False)
+        self._mark_dirty(rect)
 
     def draw_grid_lines(self):
         for i in range(1, 4):
-            x = i * self.tile_width
+            x = self._pos(i * self.tile_width)
             pygame.draw.line(
                 self.screen,
                 self.colors.DARK_GRAY,
                 (x, 0),
-                (x, self.height),
-                2
+                (x, self.screen.get_height()),
+                self._px(2)
             )
 
+    def resize(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.window = pygame.display.set_mode((width, height), pygame.SCALED if self.scaled_window else 0)
+        self.tile_width = width // 4
+        self.set_render_scale(self.render_scale)
+
+    def _mark_dirty(self, rect: pygame.Rect):
+        if self.dirty_rects:
+            self._dirty.append(rect)
+
+    def _mark_overlay(self, key: tuple):
+        self._overlay_key = key
+
+    def invalidate(self):
+        """Force the next update_display to push the whole screen."""
+        self._full_update = True
+
+    @staticmethod
+    def _merge_rects(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+        merged: List[pygame.Rect] = []
+        for rect in sorted(rects, key=lambda r: r.y):
+            if merged and rect.top <= merged[-1].bottom:
+                merged[-1].union_ip(rect)
+            else:
+                merged.append(rect.copy())
+        return merged
+
     def update_display(self):
-        pygame.display.flip()
+        if self.screen is not self.window:
+            pygame.transform.scale(self.screen, self.window.get_size(), self.window)
+            pygame.display.flip()
+        elif not self.dirty_rects:
+            pygame.display.flip()
+        elif self._full_update or self._overlay_key != self._previous_overlay_key:
+            pygame.display.flip()
+        else:
+            # Previous positions are pushed too, so moved regions get erased.
+            screen_rect = self.screen.get_rect()
+            rects = [r.clip(screen_rect) for r in self._dirty + self._previous_dirty]
+            pygame.display.update(self._merge_rects([r for r in rects if r.w and r.h]))
+
+        self._previous_dirty = self._dirty
+        self._dirty = []
+        self._previous_overlay_key = self._overlay_key
+        self._overlay_key = None
+        self._full_update = False
 
     def get_clock(self) -> pygame.time.Clock:
         return pygame.time.Clock()
@@ -1,7 +1,9 @@
 
 
 import pygame
-from typing import Optional, Tuple
+import time
+from operator import itemgetter
+from typing import Dict, Optional, Sequence, Tuple
 from enum import Enum
 
 class GameAction(Enum):
@@ -12,21 +14,106 @@ class GameAction(Enum):
     PAUSE = 4
     RESUME = 5
     CLICK = 6
+    TOGGLE_PROFILER = 7
+
+class TimedAction(tuple):
+    """
+    (action, data) pair that also carries when its event was read, as a
+    time.perf_counter() value; still unpacks as `action, data`.
+    """
+
+    def __new__(cls, action: GameAction, data=None, timestamp: Optional[float] = None):
+        self = super().__new__(cls, (action, data))
+        self.timestamp = time.perf_counter() if timestamp is None else timestamp
+        return self
+
+    action = property(itemgetter(0))
+    data = property(itemgetter(1))
+
+
+# Event types each game state ignores, blocked in SDL so they never reach
+# the Python queue. Motion, touch (SDL also synthesizes mouse clicks from
+# touches), release and text events are never used by the game.
+IGNORED_EVENTS = (
+    pygame.MOUSEMOTION, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL,
+    pygame.FINGERDOWN, pygame.FINGERUP, pygame.FINGERMOTION,
+    pygame.KEYUP, pygame.TEXTINPUT, pygame.TEXTEDITING,
+)
+BLOCKED_EVENTS = {
+    "MENU": IGNORED_EVENTS + (pygame.MOUSEBUTTONDOWN,),
+    "PLAYING": IGNORED_EVENTS,
+    "PAUSED": IGNORED_EVENTS + (pygame.MOUSEBUTTONDOWN,),
+    "GAME_OVER": IGNORED_EVENTS + (pygame.MOUSEBUTTONDOWN,),
+}
+
+# Actions never merged within a frame: each click is a tap, and two PAUSE
+# or F3 presses must cancel out rather than count once.
+UNCOALESCED_ACTIONS = frozenset((GameAction.CLICK, GameAction.PAUSE, GameAction.TOGGLE_PROFILER))
+
 
 class InputController:
 
 
-    def __init__(self):
+    def __init__(self, blocked_events: Optional[Dict[str, Sequence[int]]] = None):
         self.mouse_position: Optional[Tuple[int, int]] = None
         self.last_click_position: Optional[Tuple[int, int]] = None
 
+        self.blocked_events = BLOCKED_EVENTS if blocked_events is None else blocked_events
+        self.state: Optional[str] = None
+        self._blocked = frozenset()
+
+        # Per-frame and running counts of events read, actions produced and
+        # actions dropped as duplicates of one already seen that frame.
+        self.frame_counts = {'events': 0, 'actions': 0, 'coalesced': 0}
+        self.total_counts = {'events': 0, 'actions': 0, 'coalesced': 0, 'frames': 0}
+
+    def set_state(self, state: str):
+        """
+        Block the event types listed for state and allow the rest.
+        Only types whose status changes are touched, since SDL drops the
+        queued events of a type when it is blocked.
+        """
+        if state == self.state:
+            return
+        self.state = state
+
+        blocked = frozenset(self.blocked_events.get(state, ()))
+        if self._blocked - blocked:
+            pygame.event.set_allowed(list(self._blocked - blocked))
+        if blocked - self._blocked:
+            pygame.event.set_blocked(list(blocked - self._blocked))
+        self._blocked = blocked
+
     def process_events(self) -> list:
         actions = []
-
-        for event in pygame.event.get():
+        seen = set()
+        coalesced = 0
+
+        # pygame does not expose SDL's event timestamps, so every event is
+        # stamped when it is read from the queue.
+        events = pygame.event.get()
+        timestamp = time.perf_counter()
+        for event in events:
             action = self._process_single_event(event)
             if action:
-                actions.append(action)
+                # Every click and toggle counts; other actions repeated
+                # within one frame (a double QUIT, a held key) are kept once.
+                if action[0] not in UNCOALESCED_ACTIONS:
+                    if action[0] in seen:
+                        coalesced += 1
+                        continue
+                    seen.add(action[0])
+                actions.append(TimedAction(*action, timestamp=timestamp))
+
+        counts = self.frame_counts
+        counts['events'] = len(events)
+        counts['actions'] = len(actions)
+        counts['coalesced'] = coalesced
+        totals = self.total_counts
+        totals['events'] += len(events)
+        totals['actions'] += len(actions)
+        totals['coalesced'] += coalesced
+        totals['frames'] += 1
 
         return actions
 
@@ -60,6 +147,9 @@ class InputController:
         if key == pygame.K_p:
             return (GameAction.PAUSE, None)
 
+        if key == pygame.K_F3:
+            return (GameAction.TOGGLE_PROFILER, None)
+
         return None
 
     def _process_mouse_click(self, event: pygame.event.Event) -> Optional[Tuple[GameAction, any]]:
@@ -71,7 +161,10 @@ class InputController:
         return None
 
     def get_mouse_position(self) -> Optional[Tuple[int, int]]:
-        return self.mouse_position
+        if not pygame.event.get_blocked(pygame.MOUSEMOTION):
+            return self.mouse_position
+        # Motion events are filtered out; ask SDL for the current position.
+        return pygame.mouse.get_pos()
 
     def get_last_click_position(self) -> Optional[Tuple[int, int]]:
         return self.last_click_position
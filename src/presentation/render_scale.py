@@ -0,0 +1,48 @@
+from typing import List, Optional
+
+
+class RenderScaler:
+    """
+    Picks the render scale from measured frame times.
+
+    Frame times are collected over a window of frames; when the slow end
+    (the 90th percentile) exceeds the budget the scale steps down, and when
+    it stays well under the budget the scale steps back up. The window
+    after a change is discarded, since it includes rebuilding the caches.
+    """
+
+    def __init__(self, budget_ms: float = 10.0, min_scale: float = 0.5, max_scale: float = 1.0,
+                 step: float = 0.125, window: int = 60, headroom: float = 0.6):
+        self.budget_ms = budget_ms
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.step = step
+        self.window = window
+        self.headroom = headroom
+        self._samples: List[float] = []
+        self._cooldown = False
+
+    def record(self, frame_ms: float, scale: float) -> Optional[float]:
+        """
+        Add one frame time and return a new scale, or None to keep scale.
+        """
+        self._samples.append(frame_ms)
+        if len(self._samples) < self.window:
+            return None
+
+        samples = sorted(self._samples)
+        self._samples.clear()
+        if self._cooldown:
+            self._cooldown = False
+            return None
+
+        slow = samples[int(len(samples) * 0.9)]
+        if slow > self.budget_ms and scale > self.min_scale:
+            new_scale = max(self.min_scale, scale - self.step)
+        elif slow < self.budget_ms * self.headroom and scale < self.max_scale:
+            new_scale = min(self.max_scale, scale + self.step)
+        else:
+            return None
+
+        self._cooldown = True
+        return new_scale
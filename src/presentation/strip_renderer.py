@@ -0,0 +1,125 @@
+import math
+import pygame
+from typing import Iterator, List, Tuple
+
+
+class ScrollingStripRenderer:
+    """
+    Draws the playfield from a tall circular strip surface.
+
+    Rows never move relative to each other, so each row is painted into the
+    strip once, at its fixed offset (y - scroll), when it first appears;
+    clicked tiles are repainted once when clicked. A frame is then one
+    scrolled blit (two where the strip wraps), whatever the tile count.
+    """
+
+    def __init__(self, width: int, height: int, tile_width: int, tile_height: int, columns: int,
+                 white: pygame.Surface, black: pygame.Surface, clicked: pygame.Surface,
+                 grid_color: tuple, scale: float = 1.0, line_width: int = 2):
+        self.width = width
+        self.height = height
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        # Pixels per logical unit, for drawing at a reduced render resolution.
+        self.scale = scale
+        # Enough for the visible board plus the rows spawned above it.
+        self.strip_height = height + 2 * tile_height
+
+        self.strip = pygame.Surface((width, self.strip_height)).convert()
+        self.blank = pygame.Surface((width, self.strip_height)).convert()
+        self.blank.fill((255, 255, 255))
+        for i in range(1, columns):
+            x = i * tile_width
+            pygame.draw.line(self.blank, grid_color, (x, 0), (x, self.strip_height), line_width)
+
+        self.row_sprites = []
+        for black_column in range(columns):
+            row = self.blank.subsurface((0, 0, width, tile_height)).copy()
+            for column in range(columns):
+                row.blit(black if column == black_column else white, (column * tile_width, 0))
+            self.row_sprites.append(row)
+        self.clicked_sprite = clicked
+
+        self.generation = None
+        self.clicks = 0
+        self.painted_head = 0
+        self.clicked_rows = set()
+        self.clean_top = 0
+        self.view_top = 0
+
+    def _spans(self, top: int, height: int) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yield (strip y, offset, length) segments covering [top, top + height).
+        """
+        offset = 0
+        while offset < height:
+            strip_y = (top + offset) % self.strip_height
+            length = min(height - offset, self.strip_height - strip_y)
+            yield strip_y, offset, length
+            offset += length
+
+    def _paint(self, surface: pygame.Surface, x: int, top: int):
+        for strip_y, offset, length in self._spans(top, surface.get_height()):
+            self.strip.blit(surface, (x, strip_y), (0, offset, surface.get_width(), length))
+
+    def _clear(self, top: int, bottom: int):
+        for strip_y, _, length in self._spans(top, bottom - top):
+            self.strip.blit(self.blank, (0, strip_y), (0, strip_y, self.width, length))
+
+    def _reset(self, tiles):
+        self.strip.blit(self.blank, (0, 0))
+        self.generation = tiles.generation
+        self.clicks = tiles.clicks
+        self.painted_head = tiles.tail
+        self.clicked_rows = set()
+        # Everything at or below clean_top holds the current rows' pixels.
+        self.clean_top = -math.floor(tiles.scroll * self.scale)
+
+    def _paint_rows(self, tiles):
+        for seq, top, black_column, clicked in tiles.iter_sequenced_rows(self.painted_head):
+            top = round(top * self.scale)
+            if top < self.clean_top:
+                self._clear(top, self.clean_top)
+                self.clean_top = top
+            self._paint(self.row_sprites[black_column], 0, top)
+            if clicked:
+                self._paint(self.clicked_sprite, black_column * self.tile_width, top)
+                self.clicked_rows.add(seq)
+        self.painted_head = tiles.head
+
+    def _paint_clicks(self, tiles):
+        self.clicks = tiles.clicks
+        self.clicked_rows = {seq for seq in self.clicked_rows if seq >= tiles.tail}
+        for seq, top, black_column, clicked in tiles.iter_sequenced_rows():
+            if clicked and seq not in self.clicked_rows:
+                self._paint(self.clicked_sprite, black_column * self.tile_width, round(top * self.scale))
+                self.clicked_rows.add(seq)
+
+    def draw(self, screen: pygame.Surface, tiles, alpha: float = 1.0):
+        if tiles.generation != self.generation:
+            self._reset(tiles)
+        if tiles.head != self.painted_head:
+            self._paint_rows(tiles)
+        if tiles.clicks != self.clicks:
+            self._paint_clicks(tiles)
+
+        view_top = self.view_top = -math.floor(tiles.scroll_at(alpha) * self.scale)
+        if view_top < self.clean_top:
+            self._clear(view_top, self.clean_top)
+            self.clean_top = view_top
+
+        for strip_y, offset, length in self._spans(view_top, self.height):
+            screen.blit(self.strip, (0, offset), (0, strip_y, self.width, length))
+
+    def row_rects(self, tiles) -> List[pygame.Rect]:
+        """
+        Screen rects that can change between draws: the rows as placed by
+        the last draw, and everything below them, where culled rows are
+        still scrolling off the strip.
+        """
+        rects = [pygame.Rect(0, round(top * self.scale) - self.view_top, self.width, self.tile_height)
+                 for _, top, _, _ in tiles.iter_sequenced_rows()]
+        bottom = max((rect.bottom for rect in rects), default=0)
+        if bottom < self.height:
+            rects.append(pygame.Rect(0, bottom, self.width, self.height - bottom))
+        return rects
@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+from audio_config import NOTE_FREQUENCIES
+from src.domain.chart import HEADER as CHART_HEADER, MAGIC as CHART_MAGIC, VERSION as CHART_VERSION
+from src.domain.chart import Chart, compile_chart
+from src.domain.replay import Replay, ReplayRecorder
+from src.domain.simulation import GameSimulation, SimulationConfig
+
+SONG = {
+    'notes': ['C4', 'E4', 'G4', 'C5'],
+    'melody': ['C4', ('E4', 2), 'G4', 'G4', ('C5', 0.5), 'E4'],
+    'bpm': 90,
+    'speed_changes': {3: 5.5},
+}
+
+
+def play_session(chart=None, clock='frames', seed=7):
+    """
+    Record a session with an imperfect automatic player, stepping on the
+    frame clock ('frames'), on irregular whole-ms times ('whole') or on
+    fractional times that now and then go backwards, with fractional taps
+    ('float').
+    """
+    simulation = GameSimulation(SimulationConfig(), rng=random.Random(seed), chart=chart)
+    simulation.reset(start_time=1000)
+    ReplayRecorder.attach(simulation)
+    simulation.spawn_row()
+
+    rng = random.Random(seed)
+    now = 1000.0
+    while simulation.frames < 5000:
+        if clock == 'whole':
+            now += rng.choice((16, 17, 33))
+            over = simulation.step(now)
+        elif clock == 'float':
+            now += rng.uniform(-2, 18)
+            over = simulation.step(now)
+        else:
+            over = simulation.step()
+        if over:
+            break
+        if rng.random() < 0.2:
+            tiles = simulation.tiles
+            for y, black_column, clicked in tiles.iter_rows():
+                if not clicked:
+                    # Mostly hits; now and then a white tile ends the game.
+                    column = black_column if rng.random() < 0.995 else (black_column + 1) % tiles.columns
+                    offset = rng.uniform(1, 20) if clock == 'float' else 10
+                    simulation.tap(column * tiles.tile_width + offset, y + offset)
+                    break
+    return simulation
+
+
+def assert_same_game(played, recorded):
+    assert played.score.value == recorded.score.value
+    assert played.frames == recorded.frames
+    assert played.time == recorded.time
+    assert played.game_over == recorded.game_over
+    assert list(played.tiles.iter_rows()) == list(recorded.tiles.iter_rows())
+
+
+@pytest.mark.parametrize('clock', ('frames', 'whole', 'float'))
+def test_replay_round_trip_without_chart(clock):
+    recorded = play_session(clock=clock)
+    replay = Replay.from_bytes(recorded.recorder.to_bytes())
+
+    assert replay.config == recorded.config
+    assert replay.seed == recorded.seed
+    assert_same_game(replay.play(), recorded)
+
+
+def test_replay_round_trip_with_chart():
+    chart = Chart(compile_chart(SONG, NOTE_FREQUENCIES))
+    recorded = play_session(chart)
+    replay = Replay.from_bytes(recorded.recorder.to_bytes())
+
+    assert_same_game(replay.play(Chart(compile_chart(SONG, NOTE_FREQUENCIES))), recorded)
+
+
+def test_replay_rejects_a_missing_or_different_chart():
+    chart = Chart(compile_chart(SONG, NOTE_FREQUENCIES))
+    other = Chart(compile_chart(dict(SONG, melody=['C4', 'G4']), NOTE_FREQUENCIES))
+    charted = Replay.from_bytes(play_session(chart).recorder.to_bytes())
+    plain = Replay.from_bytes(play_session().recorder.to_bytes())
+
+    with pytest.raises(ValueError):
+        charted.play()
+    with pytest.raises(ValueError):
+        charted.play(other)
+    with pytest.raises(ValueError):
+        plain.play(chart)
+
+
+def test_replay_rejects_foreign_data():
+    with pytest.raises(ValueError):
+        Replay.from_bytes(b'PTCH' + bytes(100))
+
+
+def test_chart_round_trip():
+    chart = Chart(compile_chart(SONG, NOTE_FREQUENCIES))
+    beat_ms = 60000 / SONG['bpm']
+
+    assert len(chart) == len(SONG['melody'])
+    rows = list(chart.iter_rows())
+    assert [chart.note_name(note) for _, note, _, _ in rows] == \
+        [entry if isinstance(entry, str) else entry[0] for entry in SONG['melody']]
+    assert [interval for _, _, interval, _ in rows] == \
+        [round(beat_ms * (1 if isinstance(entry, str) else entry[1])) for entry in SONG['melody']]
+    assert [speed for _, _, _, speed in rows] == [0, 0, 0, 550, 0, 0]
+    assert [column for column, _, _, _ in rows] == [0, 1, 2, 2, 3, 1]
+
+    # Repeated notes alternate between columns playing the same note.
+    twins = Chart(compile_chart({'notes': ['C4', 'C4', 'G4', 'G4'], 'melody': ['C4'] * 3 + ['G4'] * 2},
+                                NOTE_FREQUENCIES))
+    assert [column for column, _, _, _ in twins.iter_rows()] == [0, 1, 0, 2, 3]
+
+
+def test_chart_rejects_empty_melody():
+    with pytest.raises(ValueError):
+        compile_chart(dict(SONG, melody=[]), NOTE_FREQUENCIES)
+    with pytest.raises(ValueError):
+        Chart(CHART_HEADER.pack(CHART_MAGIC, CHART_VERSION, 0, 0))
@@ -0,0 +1,55 @@
+import random
+
+from src.domain.tile_store import TileRowBuffer
+
+
+def brute_force_row_at(tiles: TileRowBuffer, y: float) -> int:
+    for seq in range(tiles.tail, tiles.head):
+        top = tiles.y[seq & tiles.mask]
+        if top <= y < top + tiles.tile_height:
+            return seq
+    return -1
+
+
+def test_row_at_matches_brute_force_scan():
+    rng = random.Random(0)
+    for _ in range(20):
+        tile_height = rng.choice((50, 100, 150))
+        board_height = rng.choice((400, 600, 800))
+        tiles = TileRowBuffer(tile_width=100, tile_height=tile_height, capacity=4)
+        tiles.push(rng.randrange(4), -tile_height)
+        for _ in range(300):
+            # Rows spawn above the board and move together; a short gap
+            # makes them overlap, as a chart with short beats does.
+            newest_top = tiles.y[(tiles.head - 1) & tiles.mask] if len(tiles) else tile_height
+            if newest_top >= rng.uniform(-tile_height, tile_height):
+                tiles.push(rng.randrange(4), -tile_height)
+            tiles.update(rng.uniform(0, tile_height / 3), board_height)
+            for _ in range(20):
+                y = rng.uniform(-tile_height, board_height)
+                assert tiles.row_at(y) == brute_force_row_at(tiles, y)
+
+
+def test_hit_test_reports_column_and_click():
+    tiles = TileRowBuffer(tile_width=100, tile_height=150)
+    seq = tiles.push(2, 0)
+
+    hit = tiles.hit_test(250, 10)
+    assert (hit.row, hit.column, hit.is_black, hit.clicked) == (seq, 2, True, False)
+    assert not tiles.hit_test(50, 10).is_black
+
+    tiles.mark_clicked(seq)
+    assert tiles.hit_test(250, 10).clicked
+    assert tiles.hit_test(250, 160) is None
+    assert tiles.hit_test(450, 10) is None
+
+
+def test_rows_keep_their_state_when_the_buffer_grows():
+    tiles = TileRowBuffer(tile_width=100, tile_height=10, capacity=2)
+    for i in range(9):
+        tiles.push(i % 4, 80 - 10 * i)
+    tiles.mark_clicked(3)
+
+    assert tiles.capacity >= 9
+    assert list(tiles.iter_rows()) == [(80 - 10 * i, i % 4, i == 3) for i in range(9)]
+    assert tiles.row_at(25) == 6